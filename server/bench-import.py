@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+TechFreedom — Import/Export Pipeline Benchmark
+
+Generates synthetic workbooks in the same column layout as
+techfreedom-database.xlsx and times each stage of import-data.py:
+
+    generate   write the synthetic workbook (cached in --workdir)
+    parse      stream raw cell values out of both sheets (openpyxl)
+    normalise  validate raw rows into tool/alternative dicts (schema checks, slugify)
+    slugify    slugify every name on its own
+    read_csv   parse + normalise the same rows from tools.csv / alternatives.csv
+    serialise  everything export_json does after the workbook is read
+    import     create records against a local stub PocketBase with --latency
+
+Each run appends one JSON line to --output, so results can be compared
+across commits.
+
+Usage:
+    pip3 install openpyxl requests
+    python3 bench-import.py                          # 50, 5k and 500k rows
+    python3 bench-import.py --sizes 50 5000 --latency 0.02 --output bench.jsonl
+    python3 bench-import.py --no-memory              # timings without tracemalloc overhead
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows
+
+
+def load_importer():
+    """Load import-data.py, whose hyphenated name rules out a plain import."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "import-data.py")
+    spec = importlib.util.spec_from_file_location("import_data", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+importer = load_importer()
+
+
+# ============================================================
+# Synthetic Workbooks
+# ============================================================
+
+TOOL_HEADERS = [
+    "Tool", "Category", "Provider", "HQ Country", "Data Hosting",
+    "Jurisdiction", "Continuity", "Surveillance", "Lock-in", "Cost Exposure",
+    "Total", "Risk Level", "Key Risks", "Last Reviewed",
+]
+
+ALTERNATIVE_HEADERS = [
+    "Alternative", "Category", "Alternative To", "Provider", "HQ Country",
+    "Open Source", "Self-hostable", "Data Hosting",
+    "Jurisdiction", "Continuity", "Surveillance", "Lock-in", "Cost Exposure",
+    "Total", "Approx Cost", "Migration Difficulty", "Trade-offs", "Last Reviewed",
+]
+
+CATEGORIES = [
+    "Email & Calendar", "Document Storage", "Video Calls", "Messaging",
+    "CRM", "Accounting", "Project Management", "Website & CMS",
+    "Forms & Surveys", "Design", "Password Management", "Analytics",
+]
+
+# Names mix accents, punctuation and brackets so slugify does real work
+NAME_PARTS = ["Cloud", "Suite", "Café", "Box (Enterprise)", "Drive+", "Hub", "Works", "Mail & Chat"]
+
+COUNTRIES = ["USA", "Germany", "France", "Netherlands", "Switzerland", "UK", "Canada"]
+
+
+def risk_level(total):
+    """Bucket a total score the same way the spreadsheet does."""
+    if total >= 20:
+        return "Critical"
+    if total >= 15:
+        return "High"
+    if total >= 10:
+        return "Medium"
+    return "Low"
+
+
+def scores(rng):
+    values = [rng.randint(1, 5) for _ in range(5)]
+    return values + [sum(values)]
+
+
+def synthetic_name(kind, i):
+    return f"{kind} {NAME_PARTS[i % len(NAME_PARTS)]} {i}"
+
+
+def write_workbook(path, rows):
+    """Write a workbook with `rows` tools and `rows` alternatives."""
+    import openpyxl
+
+    rng = random.Random(rows)
+    wb = openpyxl.Workbook(write_only=True)
+
+    ws = wb.create_sheet("Tools")
+    ws.append(TOOL_HEADERS)
+    for i in range(rows):
+        values = scores(rng)
+        ws.append([
+            synthetic_name("Tool", i), CATEGORIES[i % len(CATEGORIES)], f"Provider {i % 97}",
+            rng.choice(COUNTRIES), rng.choice(["US", "EU", "EU/US"]),
+            *values, risk_level(values[-1]),
+            "Synthetic key risks for benchmarking.", "2026-01",
+        ])
+
+    ws = wb.create_sheet("Alternatives")
+    ws.append(ALTERNATIVE_HEADERS)
+    for i in range(rows):
+        values = scores(rng)
+        targets = ", ".join(synthetic_name("Tool", rng.randrange(rows)) for _ in range(rng.randint(1, 3)))
+        ws.append([
+            synthetic_name("Alt", i), CATEGORIES[i % len(CATEGORIES)], targets,
+            f"Provider {i % 89}", rng.choice(COUNTRIES),
+            rng.choice(["Yes", "No", "Partially"]), rng.choice(["Yes", "No", "N/A"]),
+            "EU", *values, "£5/user/month", rng.choice(["Low", "Medium", "High"]),
+            "Synthetic trade-offs for benchmarking.", "2026-01",
+        ])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    wb.save(tmp_path)
+    os.replace(tmp_path, path)
+
+
+# ============================================================
+# Measurement
+# ============================================================
+
+def measure(fn, memory=True):
+    """Run fn() and return (result, stats) with wall/CPU seconds and tracemalloc peak."""
+    if memory:
+        tracemalloc.start()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        result = fn()
+        stats = {
+            "wall_s": round(time.perf_counter() - wall, 4),
+            "cpu_s": round(time.process_time() - cpu, 4),
+        }
+        if memory:
+            stats["peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1e6, 2)
+    finally:
+        if memory:
+            tracemalloc.stop()
+    return result, stats
+
+
+class RowSheet:
+    """Stands in for a read-only worksheet, replaying already-parsed rows (header first)."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def iter_rows(self, min_row=1, values_only=True):
+        return iter(self.rows)
+
+
+def parse_raw(path):
+    """Stream every raw row out of both sheets, without normalising them."""
+    wb = importer.open_workbook(path)
+    try:
+        tools = list(importer.iter_sheet_values(wb[wb.sheetnames[0]]))
+        alternatives = list(importer.iter_sheet_values(wb[wb.sheetnames[1]]))
+    finally:
+        wb.close()
+    return tools, alternatives
+
+
+def write_csv_sheets(directory, raw_tools, raw_alts):
+    """Save the raw rows (header first) as the CSV source import-data.py reads."""
+    import csv
+
+    os.makedirs(directory, exist_ok=True)
+    for name, rows in (("tools", raw_tools), ("alternatives", raw_alts)):
+        tmp_path = os.path.join(directory, f"{name}.csv.{os.getpid()}.tmp")
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+        os.replace(tmp_path, os.path.join(directory, f"{name}.csv"))
+
+
+def serialise(tools, alternatives, output_dir):
+    """Run export_json on already-parsed rows, so only the output side is timed."""
+    original = importer.load_workbook_data
+    importer.load_workbook_data = lambda *args, **kwargs: (tools, alternatives)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            importer.export_json("unused.xlsx", output_dir)
+    finally:
+        importer.load_workbook_data = original
+    return sum(os.path.getsize(os.path.join(output_dir, name)) for name in os.listdir(output_dir))
+
+
+# ============================================================
+# Stub PocketBase
+# ============================================================
+
+class StubPocketBase(BaseHTTPRequestHandler):
+    """Accepts record creates and batch requests after `latency` seconds.
+
+    GET /stats returns, then resets, the number of requests served.
+    """
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Otherwise delayed ACKs, not latency, dominate
+    latency = 0.0
+    lock = threading.Lock()
+    requests = 0
+    next_id = 0
+
+    def log_message(self, *args):
+        pass
+
+    def assign_id(self, body):
+        with self.lock:
+            StubPocketBase.next_id += 1
+            return dict(body, id=f"r{StubPocketBase.next_id:014d}")
+
+    def do_GET(self):
+        with self.lock:
+            out, StubPocketBase.requests = {"requests": StubPocketBase.requests}, 0
+        self.respond(200 if self.path == "/stats" else 404, out)
+
+    def do_POST(self):
+        with self.lock:
+            StubPocketBase.requests += 1
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"null")
+        time.sleep(self.latency)
+        if self.path == "/api/batch":
+            self.respond(200, [{"status": 200, "body": self.assign_id(r["body"])} for r in body["requests"]])
+        elif self.path.endswith("/records"):
+            self.respond(200, self.assign_id(body))
+        else:
+            self.respond(404, {"message": "not found"})
+
+    def respond(self, status, out):
+        payload = json.dumps(out).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve_stub(latency):
+    """Run the stub until killed, announcing its port on stdout."""
+    StubPocketBase.latency = latency
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubPocketBase)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    server.serve_forever()
+
+
+@contextlib.contextmanager
+def stub_server(latency):
+    """Start the stub in a child process, so its CPU time doesn't compete with the importer's."""
+    proc = subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), "--serve-stub", str(latency)],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        yield f"http://127.0.0.1:{int(proc.stdout.readline())}"
+    finally:
+        proc.kill()
+        proc.wait()
+
+
+def import_run(url, rows, workers, batch_size):
+    """Create `rows` as tools on the stub and return the number of requests sent."""
+    pb = importer.PocketBaseClient(url, pool_size=max(workers, 10))
+    pb.request("GET", "/stats")
+    with contextlib.redirect_stdout(io.StringIO()):
+        created, failures = importer.import_records(pb, "tools", rows, workers=workers, batch_size=batch_size)
+    if failures or len(created) != len(rows):
+        raise RuntimeError(f"stub import failed: {len(failures)} failures")
+    return pb.request("GET", "/stats").json()["requests"]
+
+
+# ============================================================
+# Runner
+# ============================================================
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def bench_parse(path, csv_dir, phases, memory):
+    """Time parse, normalise and slugify on the workbook; returns (tools, alternatives).
+
+    The raw rows are only needed here, so they are freed before the
+    later phases run (which matters at 500k rows).
+    """
+    (raw_tools, raw_alts), phases["parse"] = measure(lambda: parse_raw(path), memory)
+
+    def normalise():
+        return (list(importer.iter_tools(RowSheet(raw_tools))),
+                list(importer.iter_alternatives(RowSheet(raw_alts))))
+    (tools, alternatives), phases["normalise"] = measure(normalise, memory)
+
+    names = [t["name"] for t in tools] + [a["name"] for a in alternatives]
+    importer.slugify.cache_clear()  # normalise has already warmed it
+    _, phases["slugify"] = measure(lambda: importer.slugify_all(names), memory)
+
+    if not os.path.isdir(csv_dir):
+        write_csv_sheets(csv_dir, raw_tools, raw_alts)
+    return tools, alternatives
+
+
+def bench_size(rows, args):
+    """Benchmark every stage for one workbook size and return its results."""
+    memory = not args.no_memory
+    result = {"rows": rows, "phases": {}}
+    phases = result["phases"]
+
+    path = os.path.join(args.workdir, f"synthetic-{rows}.xlsx")
+    if not os.path.exists(path):
+        _, phases["generate"] = measure(lambda: write_workbook(path, rows), memory=False)
+    result["workbook_bytes"] = os.path.getsize(path)
+
+    csv_dir = os.path.join(args.workdir, f"synthetic-{rows}-csv")
+    tools, alternatives = bench_parse(path, csv_dir, phases, memory)
+    importer.slugify.cache_clear()
+    _, phases["read_csv"] = measure(lambda: importer.read_workbook(csv_dir), memory)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        result["output_bytes"], phases["serialise"] = measure(
+            lambda: serialise(tools, alternatives, output_dir), memory)
+
+    import_rows = [importer.to_record(t) for t in tools[:args.import_rows]]
+    if import_rows and importer.requests is not None:
+        with stub_server(args.latency) as url:
+            for workers, batch_size in args.import_modes:
+                label = f"import_w{workers}_b{batch_size}"
+                sent, phases[label] = measure(
+                    lambda: import_run(url, import_rows, workers, batch_size), memory=False)
+                phases[label].update(rows=len(import_rows), requests=sent,
+                                     rows_per_s=round(len(import_rows) / phases[label]["wall_s"], 1))
+
+    for name, stats in phases.items():
+        rate = f"  {stats['rows_per_s']} rows/s" if "rows_per_s" in stats else ""
+        peak = f"  peak {stats['peak_mb']} MB" if "peak_mb" in stats else ""
+        print(f"  {rows:>8} {name:<18} {stats['wall_s']:>9.3f}s wall {stats['cpu_s']:>9.3f}s cpu{peak}{rate}")
+    return result
+
+
+def import_mode(value):
+    """Parse WORKERSxBATCH, e.g. 8x0 for 8 workers without batching."""
+    try:
+        workers, batch_size = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WORKERSxBATCH, e.g. 8x0 or 1x50, got '{value}'")
+    if workers < 1 or batch_size < 0:
+        raise argparse.ArgumentTypeError("workers must be at least 1 and batch size cannot be negative")
+    return workers, batch_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the TechFreedom import/export pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 5000, 500000], metavar="ROWS", help="Rows per sheet for each synthetic workbook (default: 50 5000 500000)")
+    parser.add_argument("--workdir", default=os.path.join(tempfile.gettempdir(), "techfreedom-bench"), help="Where synthetic workbooks are kept between runs")
+    parser.add_argument("--output", default="bench-results.jsonl", help="JSON-lines file each run is appended to (default: bench-results.jsonl)")
+    parser.add_argument("--latency", type=float, default=0.01, metavar="SECONDS", help="Stub PocketBase latency per request (default: 0.01)")
+    parser.add_argument("--import-rows", type=int, default=2000, metavar="N", help="Rows sent to the stub per import mode; 0 skips the import phase (default: 2000)")
+    parser.add_argument("--import-modes", type=import_mode, nargs="+", default=[(8, 0), (1, 50)], metavar="WxB", help="Import configurations as WORKERSxBATCH (default: 8x0 1x50)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip tracemalloc, which slows parsing and normalising noticeably")
+    parser.add_argument("--serve-stub", type=float, metavar="LATENCY", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_stub is not None:
+        serve_stub(args.serve_stub)
+        return
+
+    if any(size < 1 for size in args.sizes):
+        parser.error("--sizes must be positive")
+
+    if importlib.util.find_spec("openpyxl") is None:
+        print("ERROR: openpyxl not installed. Run: pip3 install openpyxl")
+        sys.exit(1)
+    if importer.requests is None and args.import_rows:
+        print("  requests not installed, skipping the import phase")
+
+    os.makedirs(args.workdir, exist_ok=True)
+    print("=" * 60)
+    print("TechFreedom — Pipeline Benchmark")
+    print("=" * 60)
+
+    run = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "tracemalloc": not args.no_memory,
+        "latency_s": args.latency,
+        "results": [bench_size(rows, args) for rows in args.sizes],
+    }
+    if resource is not None:
+        # ru_maxrss is KiB on Linux, bytes on macOS
+        scale = 1e6 if sys.platform == "darwin" else 1e3
+        run["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale, 1)
+
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(run) + "\n")
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,25 +8,83 @@ then imports tools, alternatives, archetypes, and scoring guide data.
 Usage (PocketBase import):
     pip3 install openpyxl requests
     python3 import-data.py --url https://api.techfreedom.eu --email admin@techfreedom.eu --password YOUR_PASSWORD --xlsx techfreedom-database.xlsx
+    (add --workers 8 to send record writes concurrently over a slow link,
+     or --batch-size 50 to group them into transactional /api/batch requests;
+     throttled or failed requests are retried with backoff, see --timeout and --retries;
+     --profile reports where the time went: spreadsheet, network or serialisation)
+
+Usage (re-run against an existing PocketBase):
+    python3 import-data.py --url ... --email ... --password ... --xlsx techfreedom-database.xlsx --sync [--prune]
+    (add --plan first to see which records and fields would change, and how many
+     requests that takes, without writing anything; --plan-json FILE saves it)
 
 Usage (static JSON export — no PocketBase needed):
     pip3 install openpyxl
     python3 import-data.py --xlsx techfreedom-database.xlsx --export-json assess/data/
+    (add --hashed for minified, content-hashed, precompressed copies plus manifest.json,
+     and --columnar to store those tools/alternatives in the compact columnar layout;
+     add --watch to keep re-exporting while you edit the workbook,
+     and --sharded for a small catalogue.json plus category shards loaded on demand)
+
+Every mode checks the sheets against the collection schemas before writing
+anything: columns are matched by header (each header must name a field),
+scores and totals must be filled in with whole numbers in range, select
+values must be allowed and each total must equal its dimension sum. Add --validation-report FILE for a JSON list of the invalid cells.
+
+Any --xlsx path may instead be an .ods spreadsheet (read without openpyxl), or
+a directory holding tools.csv + alternatives.csv or tools.jsonl +
+alternatives.jsonl (header labels or field names as columns/keys), e.g. for
+generated data and CI fixtures:
+    python3 import-data.py --source fixtures/ --export-json /tmp/out/
+
+Usage (offline seeding of a fresh server or test fixture — stop PocketBase first;
+PocketBase 0.22 and 0.23+ databases work, already-seeded collections are refused):
+    python3 import-data.py --xlsx techfreedom-database.xlsx --seed-sqlite /opt/pocketbase/pb_data/data.db
+
+Usage (assessment analytics — streams the assessments collection):
+    python3 import-data.py --url ... --email ... --password ... --export-analytics assess/data/analytics.json
 
 Prerequisites (PocketBase import only):
-    1. PocketBase running and accessible
-    2. Admin account created via the PocketBase UI (https://api.techfreedom.eu/_/)
+    1. PocketBase running and accessible (0.22, or 0.23+ as installed by setup.sh:
+       collections are then sent in its "fields" layout)
+    2. Admin (PocketBase 0.23+: superuser) account created via the PocketBase UI (https://api.techfreedom.eu/_/)
 """
 
 import argparse
+import contextlib
+import csv
+import functools
+import gzip
+import hashlib
+import heapq
+import itertools
 import json
+import os
+import random
+import re
 import sys
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from xml.etree import ElementTree
 
 try:
     import requests
+    from urllib3.exceptions import NewConnectionError
 except ImportError:
     requests = None  # Only needed for PocketBase import mode
 
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows; --profile then omits memory
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Only needed for .br files in --hashed export mode
+
 
 # ============================================================
 # Collection Schemas
@@ -198,6 +256,28 @@ ARCHETYPES = [
 ]
 
 
+# Shorthand slugs used in the alternatives sheet's "alternative to" column.
+# Keep in step with SLUG_ALIASES in alternatives/index.html.
+SLUG_ALIASES = {
+    "gmail": "gmail-free",
+    "outlook": "microsoft-365",
+    "m365": "microsoft-365",
+    "teams": "microsoft-teams",
+    "google-docs": "google-workspace",
+    "google-meet": "google-workspace",
+    "google-drive": "google-workspace",
+    "monday": "monday-com",
+    "medium": "wordpress-com",
+    "azure": "aws",
+    "gcp": "aws",
+    "godaddy": "aws",
+    "figma": "canva",
+    "miro": "trello",
+    "mural": "trello",
+    "substack": "mailchimp",
+}
+
+
 # ============================================================
 # Scoring Guide Data
 # ============================================================
@@ -230,65 +310,283 @@ SCORING_GUIDE = [
     {"dimension": "costExposure", "score": 5, "label": "Critical", "description": "Monopoly pricing. Dramatic recent increases. Free tier eliminated. Captive audience."},
 ]
 
+# The five risk dimensions, in scoring guide (and heatmap) order
+DIMENSIONS = list(dict.fromkeys(entry["dimension"] for entry in SCORING_GUIDE))
+
 
 # ============================================================
 # Helpers
 # ============================================================
 
+SLUG_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slug-rules.json")
+
+PARENTHETICAL_RE = re.compile(r'\s*\(.*?\)')
+NON_SLUG_RE = re.compile(r'[^a-z0-9]+')
+
+# Filled in from SLUG_RULES_PATH (or --slug-rules) on first use
+SLUG_SPECIAL_CASES = None
+SLUG_SPECIAL_RE = None
+
+
+def load_slug_rules(path=SLUG_RULES_PATH):
+    """Load slugify's special-case table and compile it into a single pattern."""
+    global SLUG_SPECIAL_CASES, SLUG_SPECIAL_RE
+    try:
+        with open(path, encoding="utf-8") as f:
+            cases = json.load(f)["special_cases"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"ERROR: Cannot read slug rules from {path}: {e}")
+        sys.exit(1)
+
+    SLUG_SPECIAL_CASES = {phrase.lower(): slug for phrase, slug in cases.items()}
+    # Longest phrase first, so a phrase always beats any shorter one inside it
+    phrases = sorted(SLUG_SPECIAL_CASES, key=len, reverse=True)
+    SLUG_SPECIAL_RE = re.compile("|".join(map(re.escape, phrases))) if phrases else None
+    slugify.cache_clear()
+
+
+@functools.lru_cache(maxsize=1 << 16)
 def slugify(name):
-    import re
+    """Turn a tool or alternative name into its slug (memoised; names repeat a lot)."""
+    if SLUG_SPECIAL_CASES is None:
+        load_slug_rules()
     s = name.lower().strip()
-    # Handle special cases
-    s = s.replace("microsoft 365", "microsoft-365")
-    s = s.replace("monday.com", "monday-com")
-    s = s.replace("wordpress.com", "wordpress-com")
-    s = s.replace("wordpress.org", "wordpress-org")
-    s = s.replace("cal.com", "cal-com")
-    s = s.replace("x / twitter", "x-twitter")
-    s = s.replace("gmail (free/personal)", "gmail-free")
-    s = s.replace("whatsapp (organisational use)", "whatsapp")
-    s = s.replace("meta (facebook / instagram)", "meta")
-    # Generic cleanup
-    s = re.sub(r'\s*\(.*?\)', '', s)  # Remove parenthetical
-    s = re.sub(r'[^a-z0-9]+', '-', s)
-    s = s.strip('-')
-    return s
-
-
-def safe_int(v):
-    """Safely convert a value to int, returning 0 on failure."""
-    try:
-        return int(v)
-    except (TypeError, ValueError):
-        return 0
+    if SLUG_SPECIAL_RE:
+        s = SLUG_SPECIAL_RE.sub(lambda m: SLUG_SPECIAL_CASES[m.group()], s)
+    s = PARENTHETICAL_RE.sub('', s)
+    s = NON_SLUG_RE.sub('-', s)
+    return s.strip('-')
+
+
+def slugify_all(names):
+    """Slugify a whole column at once, normalising each distinct name only once."""
+    names = list(names)
+    slugs = {name: slugify(name) for name in dict.fromkeys(names)}
+    return [slugs[name] for name in names]
+
+
+def slug_collisions(rows):
+    """Map each slug used by more than one row to those rows' names."""
+    names_by_slug = {}
+    for row in rows:
+        names_by_slug.setdefault(row["slug"], []).append(row["name"])
+    return {slug: names for slug, names in names_by_slug.items() if len(names) > 1}
+
+
+# ============================================================
+# Profiling
+# ============================================================
+
+def max_rss_mb():
+    """Peak resident memory of this process so far, or None if unknown."""
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1e6 if sys.platform == "darwin" else 1e3
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+class Profiler:
+    """Wall and CPU time per phase, and latency per PocketBase endpoint.
+
+    Recording is cheap enough to leave on; the report is only printed with
+    --profile. CPU time is for the whole process, worker threads included,
+    so a phase with far more wall than CPU time is waiting on the network.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self.requests = {}
+        self.lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            self.phases.append((name, time.perf_counter() - wall, time.process_time() - cpu, max_rss_mb()))
+
+    def record_request(self, method, path, seconds):
+        endpoint = f"{method} {re.sub(r'/records/[^/]+$', '/records/:id', path)}"
+        with self.lock:
+            self.requests.setdefault(endpoint, []).append(seconds)
+
+    def report(self):
+        print("\nProfile")
+        print(f"  {'Phase':<28} {'wall':>9} {'cpu':>9} {'max RSS':>10}")
+        for name, wall, cpu, rss in self.phases:
+            rss = f"{rss:.1f} MB" if rss is not None else "-"
+            print(f"  {name:<28} {wall:>8.3f}s {cpu:>8.3f}s {rss:>10}")
+
+        if self.requests:
+            print(f"\n  {'Endpoint':<52} {'count':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+            for endpoint, times in sorted(self.requests.items()):
+                times = sorted(times)
+                cells = "".join(f" {percentile(times, pct) * 1000:>6.1f}ms" for pct in (50, 90, 99))
+                print(f"  {endpoint:<52} {len(times):>6}{cells} {times[-1] * 1000:>6.1f}ms")
+
+        rss = max_rss_mb()
+        if rss is not None:
+            print(f"\n  Peak memory (max RSS): {rss:.1f} MB")
 
 
-def parse_bool_select(v):
-    """Parse Yes/No/Partially/N-A style values from xlsx."""
-    s = str(v or "").lower().strip()
-    if s in ("yes", "true"):
-        return "Yes"
-    if s in ("no", "false"):
-        return "No"
-    if s in ("partially",):
-        return "Partially"
-    if s in ("n/a", "na"):
-        return "N/A"
-    return "No"
+PROFILE = Profiler()
+
+
+class PocketBaseError(Exception):
+    """A PocketBase request that came back with a non-success status."""
+
+    def __init__(self, status, text):
+        super().__init__(f"{status} {text[:200]}")
+        self.status = status
+        self.text = text
+
+
+class BatchNotSupported(PocketBaseError):
+    """The server has no batch endpoint, or batch requests are disabled."""
+
+
+class AdaptiveLimiter:
+    """Caps requests in flight, backing off when the server pushes back.
+
+    Additive increase, multiplicative decrease: a 429 or 503 halves the
+    limit, and every `limit` clean responses in a row raise it by one, up
+    to `maximum`.
+    """
+
+    def __init__(self, maximum):
+        self.maximum = max(1, maximum)
+        self.limit = self.maximum
+        self.active = 0
+        self.streak = 0
+        self.cond = threading.Condition()
+
+    def __enter__(self):
+        with self.cond:
+            while self.active >= self.limit:
+                self.cond.wait()
+            self.active += 1
+        return self
+
+    def __exit__(self, *exc):
+        with self.cond:
+            self.active -= 1
+            self.cond.notify_all()
+
+    def success(self):
+        with self.cond:
+            self.streak += 1
+            if self.streak >= self.limit and self.limit < self.maximum:
+                self.limit += 1
+                self.streak = 0
+                self.cond.notify_all()
+
+    def backoff(self):
+        with self.cond:
+            self.limit = max(1, self.limit // 2)
+            self.streak = 0
+
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+PUSHBACK_STATUSES = (429, 503)
+IDEMPOTENT_METHODS = ("GET", "PUT", "PATCH", "DELETE")
+RECORDS_PER_PAGE = 200
 
 
 class PocketBaseClient:
-    def __init__(self, base_url):
+    def __init__(self, base_url, pool_size=10, timeout=30, retries=4, backoff=0.5):
         self.base_url = base_url.rstrip('/')
         self.token = None
+        self.batch_supported = None  # Unknown until the first batch request
+        self.fields_layout = False     # PocketBase 0.23+: collections carry "fields", not "schema"
+        self.timeout = (min(timeout, 10), timeout)  # (connect, read) seconds
+        self.retries = retries
+        self.backoff = backoff
+        self.limiter = AdaptiveLimiter(pool_size)
         self.session = requests.Session()
+        # One pooled connection per import worker, so threads don't queue on the pool
+        adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def retry_delay(self, attempt, resp=None):
+        """Seconds to wait before retry `attempt`: Retry-After if given, else jittered exponential."""
+        if resp is not None:
+            try:
+                return min(float(resp.headers["Retry-After"]), 60.0)
+            except (KeyError, ValueError):
+                pass
+        return random.uniform(0, self.backoff * 2 ** attempt)
+
+    @staticmethod
+    def never_connected(error):
+        """Whether a request error happened before the request could reach the server.
+
+        True for a connect timeout and for a refused or unresolvable
+        connection (requests wraps urllib3's NewConnectionError in a
+        ConnectionError whose reason is that error).
+        """
+        if isinstance(error, requests.ConnectTimeout):
+            return True
+        reason = getattr(error.args[0], "reason", None) if error.args else None
+        return isinstance(reason, NewConnectionError)
+
+    def request(self, method, path, idempotent=None, **kwargs):
+        """Send a request with timeouts, the adaptive limiter and retries.
+
+        Idempotent calls are retried on 429/5xx, timeouts and dropped
+        connections. Creates are only retried when the server cannot have
+        acted on them: a 429, or a connection that was never established
+        (see never_connected).
+        """
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        kwargs.setdefault("timeout", self.timeout)
+        attempt = 0
+        while True:
+            try:
+                with self.limiter:
+                    started = time.perf_counter()
+                    try:
+                        resp = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+                    finally:
+                        PROFILE.record_request(method, path, time.perf_counter() - started)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                safe = idempotent or self.never_connected(e)
+                if not safe or attempt >= self.retries:
+                    raise
+                time.sleep(self.retry_delay(attempt))
+                attempt += 1
+                continue
+            if resp.status_code not in RETRY_STATUSES:
+                self.limiter.success()
+                return resp
+            if resp.status_code in PUSHBACK_STATUSES:
+                self.limiter.backoff()
+            if attempt >= self.retries or not (idempotent or resp.status_code == 429):
+                return resp
+            time.sleep(self.retry_delay(attempt, resp))
+            attempt += 1
 
     def authenticate(self, email, password):
-        """Authenticate as admin."""
-        resp = self.session.post(
-            f"{self.base_url}/api/admins/auth-with-password",
-            json={"identity": email, "password": password},
-        )
+        """Authenticate as admin (PocketBase < 0.23) or superuser (0.23+, which drops /api/admins).
+
+        A superuser login also switches collection payloads to the 0.23+
+        "fields" layout (see collection_payload).
+        """
+        credentials = {"identity": email, "password": password}
+        resp = self.request("POST", "/api/admins/auth-with-password", json=credentials, idempotent=True)
+        if resp.status_code == 404:
+            resp = self.request("POST", "/api/collections/_superusers/auth-with-password",
+                                json=credentials, idempotent=True)
+            self.fields_layout = True
         if resp.status_code != 200:
             print(f"Auth failed: {resp.status_code} {resp.text}")
             sys.exit(1)
@@ -298,191 +596,2401 @@ class PocketBaseClient:
 
     def list_collections(self):
         """List existing collections."""
-        resp = self.session.get(f"{self.base_url}/api/collections")
+        resp = self.request("GET", "/api/collections", params={"perPage": PLAN_PAGE_SIZE})
         resp.raise_for_status()
         return {c["name"]: c for c in resp.json().get("items", resp.json() if isinstance(resp.json(), list) else [])}
 
-    def get_collection(self, name):
-        """Get a collection by name."""
-        resp = self.session.get(f"{self.base_url}/api/collections/{name}")
-        if resp.status_code == 404:
-            return None
-        resp.raise_for_status()
-        return resp.json()
+    def import_collections(self, definitions):
+        """Create collections in one transactional request; all or none are written.
 
-    def create_collection(self, definition):
-        """Create a collection."""
-        resp = self.session.post(
-            f"{self.base_url}/api/collections",
-            json=definition,
-        )
-        if resp.status_code not in (200, 201):
-            print(f"  Failed to create collection '{definition['name']}': {resp.status_code}")
-            print(f"  {resp.text}")
-            return None
-        return resp.json()
+        Each definition carries its own id, so relations between them
+        resolve within the request. Collections not listed are left alone.
+        """
+        resp = self.request("PUT", "/api/collections/import",
+                            json={"collections": definitions, "deleteMissing": False})
+        if resp.status_code not in (200, 204):
+            raise PocketBaseError(resp.status_code, resp.text)
 
     def create_record(self, collection, data):
-        """Create a record in a collection."""
-        resp = self.session.post(
-            f"{self.base_url}/api/collections/{collection}/records",
-            json=data,
-        )
+        """Create a record in a collection. Raises PocketBaseError on failure."""
+        resp = self.request("POST", f"/api/collections/{collection}/records", json=data)
         if resp.status_code not in (200, 201):
-            print(f"  Failed to create record in '{collection}': {resp.status_code}")
-            print(f"  {resp.text[:200]}")
-            return None
+            raise PocketBaseError(resp.status_code, resp.text)
         return resp.json()
 
-    def list_records(self, collection, per_page=200, filter_str=None):
-        """List records in a collection."""
+    def update_record(self, collection, record_id, data):
+        """Patch fields on an existing record. Raises PocketBaseError on failure."""
+        resp = self.request("PATCH", f"/api/collections/{collection}/records/{record_id}", json=data)
+        if resp.status_code != 200:
+            raise PocketBaseError(resp.status_code, resp.text)
+        return resp.json()
+
+    def delete_record(self, collection, record_id):
+        """Delete a record. Raises PocketBaseError on failure."""
+        resp = self.request("DELETE", f"/api/collections/{collection}/records/{record_id}")
+        if resp.status_code != 204:
+            raise PocketBaseError(resp.status_code, resp.text)
+        return True
+
+    def batch_create(self, collection, rows):
+        """Create rows in one transactional batch request; all or none are written."""
+        resp = self.request(
+            "POST", "/api/batch",
+            json={"requests": [
+                {"method": "POST", "url": f"/api/collections/{collection}/records", "body": data}
+                for data in rows
+            ]},
+        )
+        if resp.status_code in (403, 404, 405):
+            self.batch_supported = False
+            raise BatchNotSupported(resp.status_code, resp.text)
+        if resp.status_code != 200:
+            raise PocketBaseError(resp.status_code, resp.text)
+        self.batch_supported = True
+        return [result["body"] for result in resp.json()]
+
+    def list_records(self, collection, per_page=RECORDS_PER_PAGE, filter_str=None, fields=None,
+                     sort=None, skip_total=True, prefetch=True):
+        """Yield every record in a collection, walking all pages.
+
+        Only the current page (and, with prefetch, the next one) is held in
+        memory, so large collections such as assessments can be streamed
+        and the caller can stop early. `fields` limits the returned fields
+        (e.g. ["id", "slug"]). `skip_total` skips PocketBase's total count
+        query. Paging then stops at the first short page.
+        """
         params = {"perPage": per_page}
         if filter_str:
             params["filter"] = filter_str
-        resp = self.session.get(
-            f"{self.base_url}/api/collections/{collection}/records",
-            params=params,
-        )
-        resp.raise_for_status()
-        return resp.json().get("items", [])
+        if fields:
+            params["fields"] = ",".join(fields)
+        if sort:
+            params["sort"] = sort
+        if skip_total:
+            params["skipTotal"] = 1
+
+        def fetch(page):
+            resp = self.request(
+                "GET", f"/api/collections/{collection}/records",
+                params=dict(params, page=page),
+            )
+            resp.raise_for_status()
+            return resp.json()
+
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 1
+            pending = pool.submit(fetch, page) if pool else None
+            while True:
+                data = pending.result() if pool else fetch(page)
+                items = data.get("items", [])
+                total_pages = data.get("totalPages", -1)
+                more = len(items) == per_page if total_pages < 0 else page < total_pages
+                if more and pool:
+                    # Fetch the next page while the caller works through this one
+                    pending = pool.submit(fetch, page + 1)
+                yield from items
+                if not more:
+                    break
+                page += 1
+        finally:
+            if pool:
+                pool.shutdown(wait=False, cancel_futures=True)
 
 
 # ============================================================
-# Main
+# Collection & Archetype Records
 # ============================================================
 
-def read_tools_from_xlsx(xlsx_path):
-    """Read tools from xlsx and return list of dicts in internal format."""
-    import openpyxl
+# PocketBase 0.23 made created/updated ordinary "autodate" fields that a
+# collection has only if it lists them, and wants multi-relations to give
+# a maxSelect (999 is what its admin UI uses for "multiple").
+PB_AUTODATE_FIELDS = [
+    {"name": "created", "type": "autodate", "onCreate": True, "onUpdate": False},
+    {"name": "updated", "type": "autodate", "onCreate": True, "onUpdate": True},
+]
+PB_MAX_SELECT = 999
+
+PB_ID_ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
 
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    ws_tools = wb[wb.sheetnames[0]]
-    tools = []
 
-    for i, row in enumerate(ws_tools.iter_rows(min_row=2)):
-        vals = [c.value for c in row]
-        if vals[0] is None:
-            break
+def pb_id(length=15):
+    """Random id in PocketBase's format (15 lowercase alphanumerics for records/collections)."""
+    import secrets
+
+    return "".join(secrets.choice(PB_ID_ALPHABET) for _ in range(length))
+
+
+
+def pb_fields(schema):
+    """Convert schema entries to PocketBase 0.23+ "fields", whose options sit on the field itself."""
+    fields = []
+    for field in schema:
+        options = dict(field.get("options") or {})
+        if field["type"] == "relation" and options.get("maxSelect") is None:
+            options["maxSelect"] = PB_MAX_SELECT
+        if field["type"] == "select":
+            options.setdefault("maxSelect", 1)
+        fields.append({"name": field["name"], "type": field["type"],
+                       "required": field.get("required", False), **options})
+    return fields + [dict(field) for field in PB_AUTODATE_FIELDS]
+
+
+def collection_payload(coll_def, collection_ids, fields_layout=False):
+    """Build a collection definition, replacing the __tools__ placeholder with the real tools ID.
 
-        name = str(vals[0])
-        slug = slugify(name)
-
-        tools.append({
-            "id": i + 1,
-            "name": name,
-            "slug": slug,
-            "category": str(vals[1] or ""),
-            "provider": str(vals[2] or ""),
-            "hqCountry": str(vals[3] or ""),
-            "dataHosting": str(vals[4] or ""),
-            "jurisdiction": safe_int(vals[5]),
-            "continuity": safe_int(vals[6]),
-            "surveillance": safe_int(vals[7]),
-            "lockIn": safe_int(vals[8]),
-            "costExposure": safe_int(vals[9]),
-            "total": safe_int(vals[10]),
-            "riskLevel": str(vals[11] or ""),
-            "keyRisks": str(vals[12] or ""),
+    With fields_layout, the schema is sent as PocketBase 0.23+ "fields".
+    """
+    name = coll_def["name"]
+    schema = []
+    for field in coll_def["schema"]:
+        field_copy = dict(field)
+        if field_copy.get("options", {}).get("collectionId") == "__tools__":
+            if "tools" not in collection_ids:
+                print(f"  ERROR: 'tools' collection must be created before '{name}'")
+                sys.exit(1)
+            field_copy["options"] = dict(field_copy["options"])
+            field_copy["options"]["collectionId"] = collection_ids["tools"]
+        schema.append(field_copy)
+
+    return {
+        "name": name,
+        "type": coll_def["type"],
+        **({"fields": pb_fields(schema)} if fields_layout else {"schema": schema}),
+        "listRule": coll_def.get("listRule"),
+        "viewRule": coll_def.get("viewRule"),
+        "createRule": coll_def.get("createRule"),
+        "updateRule": coll_def.get("updateRule"),
+        "deleteRule": coll_def.get("deleteRule"),
+    }
+
+
+def archetype_records(tool_slug_to_id):
+    """Build archetype records whose tools relation points at stored tool IDs."""
+    rows = []
+    for arch in ARCHETYPES:
+        tool_ids = []
+        for ts in arch["tool_slugs"]:
+            if ts in tool_slug_to_id:
+                tool_ids.append(tool_slug_to_id[ts])
+            else:
+                print(f"  WARNING: Tool slug '{ts}' not found for archetype '{arch['name']}'")
+
+        rows.append({
+            "name": arch["name"],
+            "slug": arch["slug"],
+            "description": arch["description"],
+            "tools": tool_ids,
         })
+    return rows
+
+
+# ============================================================
+# Concurrent Import
+# ============================================================
+
+def record_key(data):
+    """Natural key for a record: its slug, or dimension:score for the scoring guide."""
+    if data.get("slug"):
+        return data["slug"]
+    if "dimension" in data:
+        return f"{data['dimension']}:{normalise_value(data.get('score'))}"
+    return data.get("name", "?")
+
+
+def run_each(fn, items, workers=1):
+    """Call fn on every item, up to `workers` at a time.
+
+    Returns (result, error) pairs in input order; network and API errors are
+    captured rather than raised.
+    """
+    def call(item):
+        try:
+            return fn(item), None
+        except (PocketBaseError, requests.RequestException) as e:
+            return None, e
+
+    if workers > 1 and len(items) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(call, items))
+    return [call(item) for item in items]
+
+
+def failure(collection, data, error):
+    """Describe a rejected write for the end-of-run failure report."""
+    return {
+        "collection": collection,
+        "key": record_key(data),
+        "status": getattr(error, "status", None),
+        "error": str(error),
+    }
+
+
+def import_records(pb, collection, rows, workers=1, batch_size=0, journal=None):
+    """Create rows in a collection using up to `workers` concurrent requests.
+
+    With `batch_size`, rows are first sent as transactional batches of that
+    many creates. If the server has no batch support, the remaining rows fall
+    back to one request each. Each write is entered in `journal` (an
+    ImportJournal) as soon as it succeeds.
+
+    Returns (created, failures). `created` holds (row, record) pairs in input
+    order; `failures` holds one dict per rejected row so the caller can report
+    them all at the end instead of losing them in the scroll-back.
+    """
+    outcomes = [None] * len(rows)
+    pending = range(len(rows))
+
+    if batch_size and pb.batch_supported is not False:
+        for start in range(0, len(rows), batch_size):
+            chunk = rows[start:start + batch_size]
+            try:
+                records = pb.batch_create(collection, chunk)
+            except BatchNotSupported:
+                print("  Batch API unavailable, falling back to per-record writes")
+                pending = range(start, len(rows))
+                break
+            except (PocketBaseError, requests.RequestException) as e:
+                # The batch is rolled back as a whole, so every row in it failed
+                records = [None] * len(chunk)
+                error = e
+            else:
+                error = None
+                if journal:
+                    for data, record in zip(chunk, records):
+                        journal.record(collection, record_key(data), record["id"])
+            for i, record in enumerate(records):
+                outcomes[start + i] = (record, error)
+        else:
+            pending = range(0)
+
+    def create(data):
+        record = pb.create_record(collection, data)
+        if journal:
+            journal.record(collection, record_key(data), record["id"])
+        return record
+
+    for i, outcome in zip(pending, run_each(create, [rows[i] for i in pending], workers)):
+        outcomes[i] = outcome
+
+    created = []
+    failures = []
+    for data, (record, error) in zip(rows, outcomes):
+        if record is None:
+            failures.append(failure(collection, data, error))
+        else:
+            created.append((data, record))
+    return created, failures
+
+
+# ============================================================
+# Incremental Sync
+# ============================================================
+
+def normalise_value(v):
+    """Normalise a field value so workbook rows and stored records compare equal."""
+    if v is None:
+        return ""
+    if isinstance(v, float) and v.is_integer():
+        return int(v)
+    if isinstance(v, str):
+        return v.strip()
+    if isinstance(v, list):
+        return [normalise_value(x) for x in v]
+    return v
+
+
+def row_digest(data, fields=None):
+    """Stable hash over the normalised fields of a row (or the given subset)."""
+    fields = sorted(fields if fields is not None else data)
+    canonical = {f: normalise_value(data.get(f)) for f in fields}
+    return hashlib.sha1(json.dumps(canonical, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def sync_records(pb, collection, rows, workers=1, batch_size=0):
+    """Upsert rows into a collection, keyed by record_key().
+
+    Existing records are fetched once. Rows that are new are created, rows
+    whose field hash differs from the stored record are PATCHed, and the rest
+    are left alone. Nothing is deleted here: stored records with no matching
+    row (including duplicates left by earlier create-only imports) are
+    returned as `stale` so the caller can prune them once every collection
+    has been synced.
+
+    Returns (changes, failures, stale). `changes` holds (op, row, record)
+    tuples in input order, where op is "+" (created), "~" (updated) or
+    "=" (unchanged).
+    """
+    existing = {}
+    stale = []
+    for record in pb.list_records(collection):
+        key = record_key(record)
+        if key in existing:
+            stale.append(record)
+        else:
+            existing[key] = record
+
+    ops = []
+    to_create = []
+    to_update = []
+    for data in rows:
+        record = existing.pop(record_key(data), None)
+        if record is None:
+            ops.append(("+", None))
+            to_create.append(data)
+        elif row_digest(data) != row_digest(record, fields=data):
+            ops.append(("~", record))
+            to_update.append((data, record))
+        else:
+            ops.append(("=", record))
+    stale.extend(existing.values())
+
+    created, failures = import_records(pb, collection, to_create, workers, batch_size)
+    written = {id(data): record for data, record in created}
+
+    update = lambda pair: pb.update_record(collection, pair[1]["id"], pair[0])  # noqa: E731
+    for (data, _), (record, error) in zip(to_update, run_each(update, to_update, workers)):
+        if record is None:
+            failures.append(failure(collection, data, error))
+        else:
+            written[id(data)] = record
+
+    changes = []
+    for (op, record), data in zip(ops, rows):
+        if op != "=":
+            record = written.get(id(data))
+            if record is None:
+                continue  # Reported in failures
+        changes.append((op, data, record))
+    return changes, failures, stale
+
+
+def prune_records(pb, collection, records, workers=1):
+    """Delete stale records left over after a sync. Returns failures."""
+    delete = lambda record: pb.delete_record(collection, record["id"])  # noqa: E731
+    failures = []
+    for record, (ok, error) in zip(records, run_each(delete, records, workers)):
+        if ok:
+            print(f"  - {collection}/{record_key(record)}")
+        else:
+            failures.append(failure(collection, record, error))
+    return failures
+
+
+def write_records(pb, collection, rows, args, failures, stale, journal=None):
+    """Create rows (or upsert them with --sync) and return the (op, row, record) changes.
+
+    Rows already entered in a resumed journal are not written again; they
+    come back as unchanged ("=") with the journalled record id.
+    """
+    with PROFILE.phase(f"import {collection}"):
+        if args.sync:
+            changes, failed, old = sync_records(pb, collection, rows, args.workers, args.batch_size)
+            stale.append((collection, old))
+            counts = {op: sum(1 for c in changes if c[0] == op) for op in "+~="}
+            print(f"  {counts['+']} created, {counts['~']} updated, {counts['=']} unchanged, {len(old)} stale")
+        else:
+            done = journal.completed(collection) if journal else {}
+            todo = [data for data in rows if record_key(data) not in done]
+            if len(todo) < len(rows):
+                print(f"  Resuming: {len(rows) - len(todo)} already written, {len(todo)} to go")
+            created, failed = import_records(pb, collection, todo, args.workers, args.batch_size, journal)
+            changes = [("=", data, {"id": done[record_key(data)]}) for data in rows if record_key(data) in done]
+            changes.extend(("+", data, record) for data, record in created)
+    failures.extend(failed)
+    return changes
+
+
+# ============================================================
+# Dry-Run Plan
+# ============================================================
+
+# Collections this script seeds, in import order; the rest are compared by schema only
+SEEDED_COLLECTIONS = ["tools", "alternatives", "archetypes", "scoring_guide"]
+RULE_FIELDS = ["listRule", "viewRule", "createRule", "updateRule", "deleteRule"]
+PLAN_PAGE_SIZE = 500  # PocketBase's maximum perPage
+
+
+def schema_drift(coll_def, live):
+    """Describe how a stored collection differs from its COLLECTIONS definition."""
+    drift = []
+    if "fields" in live:
+        # PocketBase 0.23+: options sit on the field, and id is always there
+        expected = pb_fields(coll_def["schema"])
+        live_fields = {field["name"]: field for field in live["fields"] if field["name"] != "id"}
+
+        def options_of(field):
+            return {k: v for k, v in field.items() if k not in ("name", "type", "required")}
+    else:
+        expected = coll_def["schema"]
+        live_fields = {field["name"]: field for field in live.get("schema", [])}
+
+        def options_of(field):
+            return field.get("options") or {}
+    for field in expected:
+        name = field["name"]
+        current = live_fields.pop(name, None)
+        if current is None:
+            drift.append(f"field '{name}' ({field['type']}) is missing")
+            continue
+        if current.get("type") != field["type"]:
+            drift.append(f"field '{name}' is {current.get('type')}, expected {field['type']}")
+        if bool(current.get("required")) != bool(field.get("required")):
+            drift.append(f"field '{name}' required is {bool(current.get('required'))}, expected {bool(field.get('required'))}")
+        current_options = options_of(current)
+        for key, value in options_of(field).items():
+            # collectionId is a placeholder here; the server holds the real id
+            if key != "collectionId" and current_options.get(key) != value:
+                drift.append(f"field '{name}' {key} is {current_options.get(key)!r}, expected {value!r}")
+    for name in live_fields:
+        drift.append(f"field '{name}' is not defined in this script")
+    for rule in RULE_FIELDS:
+        if live.get(rule) != coll_def.get(rule):
+            drift.append(f"{rule} is {live.get(rule)!r}, expected {coll_def.get(rule)!r}")
+    return drift
+
+
+def field_changes(data, record):
+    """Map each field whose row value differs from the stored record to {"from", "to"}."""
+    return {
+        field: {"from": record.get(field), "to": value}
+        for field, value in data.items()
+        if normalise_value(value) != normalise_value(record.get(field))
+    }
+
+
+def diff_records(rows, records, sync=True):
+    """Compare rows with stored records the way the import would apply them.
+
+    With sync the comparison matches sync_records: new keys are created,
+    changed rows are patched field by field and leftover records are stale.
+    A create-only import writes every row, so rows whose key is already
+    stored are listed as duplicates instead.
+    """
+    existing = {}
+    stale = []
+    for record in records:
+        key = record_key(record)
+        if key in existing:
+            stale.append(record)
+        else:
+            existing[key] = record
+
+    diff = {"create": [], "update": [], "unchanged": 0, "stale": [], "duplicates": []}
+    for data in rows:
+        key = record_key(data)
+        record = existing.pop(key, None)
+        if not sync:
+            diff["create"].append(key)
+            if record is not None:
+                diff["duplicates"].append(key)
+        elif record is None:
+            diff["create"].append(key)
+        else:
+            changes = field_changes(data, record)
+            if changes:
+                diff["update"].append({"key": key, "id": record["id"], "fields": changes})
+            else:
+                diff["unchanged"] += 1
+    if sync:
+        diff["stale"] = [record_key(record) for record in stale + list(existing.values())]
+    return diff
+
+
+def plan_import(pb, tools, alternatives, args):
+    """Work out what an import with these args would change, without writing anything.
+
+    All collections come from one listing, so assessments is compared by
+    schema only and its records are never read. The seeded collections
+    are fetched in full pages, concurrently, and diffed in memory.
+    Returns a JSON-ready plan including the requests the real run makes.
+    """
+    live_collections = pb.list_collections()
+    collections = {}
+    for coll_def in COLLECTIONS:
+        live = live_collections.get(coll_def["name"])
+        if live is None:
+            collections[coll_def["name"]] = {"action": "create", "drift": []}
+        else:
+            collections[coll_def["name"]] = {"action": "keep", "drift": schema_drift(coll_def, live)}
+
+    present = [name for name in SEEDED_COLLECTIONS if name in live_collections]
+    fetch = lambda name: list(pb.list_records(name, per_page=PLAN_PAGE_SIZE))  # noqa: E731
+    stored = {}
+    for name, (records, error) in zip(present, run_each(fetch, present, workers=len(present))):
+        if error is not None:
+            print(f"  ERROR: could not read '{name}': {error}")
+            sys.exit(1)
+        stored[name] = records
+
+    # Archetypes point at tool ids; tools that don't exist yet get a placeholder
+    tool_ids = {tool["slug"]: f"<new {tool['slug']}>" for tool in tools}
+    if args.sync:
+        for record in reversed(stored.get("tools", [])):
+            if record_key(record) in tool_ids:
+                tool_ids[record_key(record)] = record["id"]
+
+    rows = {
+        "tools": [to_record(t) for t in tools],
+        "alternatives": [to_record(a) for a in alternatives],
+        "archetypes": archetype_records(tool_ids),
+        "scoring_guide": SCORING_GUIDE,
+    }
+    records = {name: diff_records(rows[name], stored.get(name, []), args.sync) for name in SEEDED_COLLECTIONS}
+
+    counts = {"auth": 1, "collection": 0, "list": 0, "create": 0, "update": 0, "delete": 0}
+    if not args.skip_collections:
+        counts["collection"] = len(COLLECTIONS) + sum(1 for c in collections.values() if c["action"] == "create")
+    for name, diff in records.items():
+        creates = len(diff["create"])
+        counts["create"] += -(-creates // args.batch_size) if args.batch_size else creates
+        if args.sync:
+            # Paging stops at the first short page, so a full last page costs one more request
+            counts["list"] += len(stored.get(name, [])) // RECORDS_PER_PAGE + 1
+            counts["update"] += len(diff["update"])
+            if args.prune:
+                counts["delete"] += len(diff["stale"])
+    counts["total"] = sum(counts.values())
+
+    return {
+        "target": pb.base_url,
+        "mode": "sync" if args.sync else "create",
+        "prune": bool(args.prune),
+        "collections": collections,
+        "records": records,
+        "requests": counts,
+    }
+
+
+def short_value(value, width=40):
+    """repr() of a field value, cut down to fit one plan line."""
+    text = repr(value)
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def print_plan(plan):
+    """Print a plan from plan_import: + create, ~ update, - delete, ! differs."""
+    mode = "--sync" + (" --prune" if plan["prune"] else "") if plan["mode"] == "sync" else "create-only"
+    print(f"\nPlan for {plan['target']} ({mode}); nothing has been written")
+
+    print("\n  Collections:")
+    for name, coll in plan["collections"].items():
+        scope = "" if name in plan["records"] else " (schema only)"
+        if coll["action"] == "create":
+            print(f"    + {name}{scope}")
+        elif coll["drift"]:
+            print(f"    ! {name}{scope}: schema differs (the import leaves existing collections alone)")
+            for line in coll["drift"]:
+                print(f"        {line}")
+        else:
+            print(f"    = {name}{scope}")
+
+    print("\n  Records:")
+    for name, diff in plan["records"].items():
+        summary = f"{len(diff['create'])} to create"
+        if plan["mode"] == "sync":
+            action = "to delete" if plan["prune"] else "stale, kept without --prune"
+            summary += f", {len(diff['update'])} to update, {diff['unchanged']} unchanged, {len(diff['stale'])} {action}"
+        if diff["duplicates"]:
+            summary += f", {len(diff['duplicates'])} already stored (would be duplicated; use --sync)"
+        print(f"    {name}: {summary}")
+        if plan["mode"] != "sync":
+            continue
+        for key in diff["create"]:
+            print(f"      + {key}")
+        for change in diff["update"]:
+            fields = ", ".join(f"{field} {short_value(c['from'])} -> {short_value(c['to'])}"
+                               for field, c in change["fields"].items())
+            print(f"      ~ {change['key']}: {fields}")
+        for key in diff["stale"]:
+            print(f"      {'-' if plan['prune'] else '?'} {key}")
+
+    counts = plan["requests"]
+    parts = ", ".join(f"{n} {kind}" for kind, n in counts.items() if kind != "total" and n)
+    print(f"\n  Requests the import would make: {counts['total']} ({parts})")
+
+
+# ============================================================
+# Checkpoint Journal
+# ============================================================
+
+class ImportJournal:
+    """Append-only JSON-lines log of completed record writes.
+
+    The first line names the PocketBase URL being imported into. Each
+    following line is {"c": collection, "k": record key, "id": record id},
+    written and flushed as soon as the record is created. Because of that,
+    an import interrupted by a network drop or a server restart can resume
+    with --resume. It skips finished rows and rebuilds tool_slug_to_id
+    without reading any collection back.
+    """
+
+    def __init__(self, path, target, resume=False):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+
+        if resume and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get("target") != target:
+                    print(f"ERROR: journal {path} is for {header.get('target')!r}, not {target!r}")
+                    sys.exit(1)
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # Torn final line from the interrupted run
+                    self.entries.setdefault(entry["c"], {})[entry["k"]] = entry["id"]
+            self.file = open(path, "a", encoding="utf-8")
+            print(f"  Resuming from {path} ({sum(map(len, self.entries.values()))} records already written)")
+        else:
+            self.file = open(path, "w", encoding="utf-8")
+            self.file.write(json.dumps({"target": target}) + "\n")
+            self.file.flush()
+
+    def completed(self, collection):
+        """{record key: record id} for rows of `collection` written so far.
+
+        Returns a copy: record() keeps adding to the journal's own entries
+        while an import runs, and callers want the state before it.
+        """
+        return dict(self.entries.get(collection, {}))
+
+    def record(self, collection, key, record_id):
+        with self.lock:
+            self.entries.setdefault(collection, {})[key] = record_id
+            self.file.write(json.dumps({"c": collection, "k": key, "id": record_id}) + "\n")
+            self.file.flush()
+
+    def close(self, remove=False):
+        self.file.close()
+        if remove:
+            os.remove(self.path)
+
+
+def print_failures(failures):
+    """Print the per-record failures collected during an import."""
+    print(f"\n  {len(failures)} record(s) failed:")
+    for f in failures:
+        print(f"  ! {f['collection']}/{f['key']}: {f['error']}")
+
+
+# ============================================================
+# Workbook Validation
+# ============================================================
 
-    return tools
+# Header spellings that don't reduce to the field name they hold
+HEADER_ALIASES = {
+    "tool": "name",
+    "alternative": "name",
+}
+
+# Fields the sheets don't hold, derived from the validated row instead
+DERIVED_FIELDS = {
+    "slug": lambda row: slugify(row["name"]),
+}
+
+# Spreadsheet spellings accepted for select values beyond a case-insensitive match
+SELECT_SYNONYMS = {
+    "true": "yes",
+    "false": "no",
+    "na": "n/a",
+}
+
+DASHES_RE = re.compile(r"[\u2010-\u2015]")
+
+# Every sheet must fill these, even where a collection leaves them optional
+# (alternatives): a blank or missing score would otherwise be read as 0.
+SCORE_FIELDS = DIMENSIONS + ["total"]
+
+
+class WorkbookInvalid(Exception):
+    """The workbook has cells that break the collection schemas."""
+
+    def __init__(self, errors):
+        super().__init__(f"{len(errors)} invalid cell(s) in the workbook")
+        self.errors = errors
+
+
+def schema_fields(collection):
+    """Map each field name of a COLLECTIONS entry to its definition, in schema order.
+
+    SCORE_FIELDS are marked required, so a blank score cell or a missing
+    score column is reported rather than read as 0.
+    """
+    for coll_def in COLLECTIONS:
+        if coll_def["name"] == collection:
+            return {field["name"]: dict(field, required=True) if field["name"] in SCORE_FIELDS else field
+                    for field in coll_def["schema"]}
+    raise KeyError(collection)
+
+
+def header_key(label):
+    """Reduce a header cell to a lowercase field name, e.g. 'Lock-in' -> 'lockin'."""
+    key = NON_SLUG_RE.sub("", str(label or "").lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def column_letter(index):
+    """Spreadsheet column name for a 0-based index: 0 -> 'A', 26 -> 'AA'."""
+    letters = ""
+    index += 1
+    while index:
+        index, rem = divmod(index - 1, 26)
+        letters = chr(ord("A") + rem) + letters
+    return letters
+
+
+def convert_cell(field, value):
+    """Convert a cell to its schema type, raising ValueError with the reason it doesn't fit."""
+    options = field.get("options") or {}
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if field.get("required"):
+            raise ValueError("is required")
+        return 0 if field["type"] == "number" else ""
+
+    if field["type"] == "number":
+        try:
+            if isinstance(value, bool):
+                raise ValueError
+            number = float(value)
+        except (TypeError, ValueError):
+            raise ValueError("is not a number") from None
+        if not number.is_integer():
+            raise ValueError("is not a whole number")
+        number = int(number)
+        low, high = options.get("min"), options.get("max")
+        if (low is not None and number < low) or (high is not None and number > high):
+            raise ValueError(f"is outside {low}-{high}")
+        return number
+
+    if field["type"] == "select":
+        choices = {choice.lower(): choice for choice in options["values"]}
+        key = DASHES_RE.sub("-", str(value).strip().lower())
+        key = SELECT_SYNONYMS.get(key, key)
+        if key not in choices:
+            raise ValueError(f"is not one of {', '.join(options['values'])}")
+        return choices[key]
+
+    text = str(value)
+    if "min" in options and len(text) < options["min"]:
+        raise ValueError(f"is shorter than {options['min']} characters")
+    if "max" in options and len(text) > options["max"]:
+        raise ValueError(f"is longer than {options['max']} characters")
+    if "pattern" in options and not re.match(options["pattern"], text):
+        raise ValueError(f"does not match {options['pattern']}")
+    return text
+
+
+def map_columns(sheet, header, fields, errors):
+    """Return [(column index, field)] for each header cell naming a field.
+
+    A labelled header cell that names no field is an error too: a renamed
+    column ("Total Score") would otherwise be ignored and its field left empty.
+    """
+    by_key = {name.lower(): name for name in fields}
+    columns = []
+    seen = {}
+    for i, label in enumerate(header):
+        if label is None or not str(label).strip():
+            continue
+        name = by_key.get(header_key(label))
+        if name is None:
+            errors.append({"sheet": sheet, "cell": f"{column_letter(i)}1", "field": "(header)",
+                           "value": label, "message": "matches no field"})
+            continue
+        if name in DERIVED_FIELDS:
+            continue
+        if name in seen:
+            errors.append({"sheet": sheet, "cell": f"{column_letter(i)}1", "field": name,
+                           "value": label, "message": f"duplicates column {seen[name]}"})
+            continue
+        seen[name] = column_letter(i)
+        columns.append((i, fields[name]))
+
+    for name, field in fields.items():
+        if name not in seen and name not in DERIVED_FIELDS and field.get("required"):
+            errors.append({"sheet": sheet, "cell": "1", "field": name,
+                           "value": None, "message": "has no column"})
+    return columns
+
+
+def iter_sheet_records(ws, collection, errors=None):
+    """Yield each data row of ws as a dict in collection's schema order, validated in one pass.
+
+    Columns are found by header, so they may be reordered, but every
+    labelled column must name a field. Every problem in the sheet is appended to errors (one dict per cell)
+    and the offending rows are left out. Without an errors list,
+    WorkbookInvalid is raised once the whole sheet has been read.
+    """
+    collect = errors is None
+    if collect:
+        errors = []
+    sheet = getattr(ws, "title", collection)
+    fields = schema_fields(collection)
+    rows = iter_sheet_values(ws)
+    reported = len(errors)
+    columns = map_columns(sheet, next(rows, ()), fields, errors)
+    letters = {field["name"]: column_letter(i) for i, field in columns}
+    if len(errors) > reported:
+        # Without the right columns every row would be reported; the header is the fix
+        rows = ()
+    # Optional columns missing from the sheet still get their empty value
+    defaults = {name: convert_cell(field, None) for name, field in fields.items()
+                if name not in letters and name not in DERIVED_FIELDS and not field.get("required")}
+
+    for number, vals in enumerate(rows, start=2):
+        row = dict(defaults)
+        bad = False
+        for i, field in columns:
+            value = vals[i] if i < len(vals) else None
+            try:
+                row[field["name"]] = convert_cell(field, value)
+            except ValueError as e:
+                errors.append({"sheet": sheet, "cell": f"{column_letter(i)}{number}",
+                               "field": field["name"], "value": value, "message": str(e)})
+                bad = True
+        if bad:
+            continue
+
+        expected = sum(row[d] for d in DIMENSIONS)
+        if row["total"] != expected:
+            errors.append({"sheet": sheet, "cell": f"{letters['total']}{number}", "field": "total",
+                           "value": row["total"], "message": f"does not equal the dimension sum {expected}"})
+            continue
+
+        for name, derive in DERIVED_FIELDS.items():
+            if name in fields:
+                try:
+                    row[name] = convert_cell(fields[name], derive(row))
+                except ValueError as e:
+                    errors.append({"sheet": sheet, "cell": f"{letters['name']}{number}", "field": name,
+                                   "value": row.get("name"), "message": str(e)})
+                    bad = True
+        if bad:
+            continue
+
+        yield {name: row[name] for name in fields if name in row}
+
+    if collect and errors:
+        raise WorkbookInvalid(errors)
+
+
+def print_validation_errors(errors, limit=50):
+    """Print one line per invalid cell, e.g. "Tools!F12 jurisdiction 'x': is not a number"."""
+    print(f"\nERROR: {len(errors)} invalid cell(s) in the workbook:")
+    for e in errors[:limit]:
+        print(f"  {e['sheet']}!{e['cell']} {e['field']} {e['value']!r}: {e['message']}")
+    if len(errors) > limit:
+        print(f"  ... and {len(errors) - limit} more (see --validation-report)")
+
+
+def write_validation_report(path, xlsx_path, errors):
+    """Write the invalid cells as JSON for CI annotations or a follow-up script."""
+    report = {"workbook": os.path.basename(xlsx_path), "errorCount": len(errors), "errors": errors}
+    with open(path, "w", encoding="utf-8") as f:
+        # Dates and other cell types become their spreadsheet text
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+    print(f"  Validation report written to {path}")
+
+
+# ============================================================
+# Source Readers
+# ============================================================
+
+# Every source yields one sheet per entry here. Workbooks pick sheets by
+# title, falling back to this order; CSV and JSON-lines sources are a
+# directory holding one <sheet>.csv / <sheet>.jsonl file per sheet.
+SOURCE_SHEETS = ["tools", "alternatives"]
+
+ODS_NS = {
+    "office": "urn:oasis:names:tc:opendocument:xmlns:office:1.0",
+    "table": "urn:oasis:names:tc:opendocument:xmlns:table:1.0",
+    "text": "urn:oasis:names:tc:opendocument:xmlns:text:1.0",
+}
+
+
+def ods_name(prefix, local):
+    """ElementTree's {namespace}local form of an ODS tag or attribute."""
+    return f"{{{ODS_NS[prefix]}}}{local}"
+
+
+class StreamedSheet:
+    """A sheet that streams its rows, header first, like openpyxl's read-only worksheets."""
+
+    def __init__(self, title, rows):
+        self.title = title
+        self.rows = rows  # Callable returning a fresh iterator of row tuples
+
+    def iter_rows(self, values_only=True):
+        return self.rows()
+
+
+def open_workbook(xlsx_path):
+    """Open the workbook in streaming read-only mode (remember to close it)."""
+    try:
+        import openpyxl
+    except ImportError:
+        print("ERROR: openpyxl not installed. Run: pip3 install openpyxl")
+        print("       (or convert the workbook to .ods, or to CSV / JSON-lines sheets)")
+        sys.exit(1)
+
+    return openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+
+
+def pick_sheets(path, sheets):
+    """Match each of SOURCE_SHEETS to a sheet by title, or else by position."""
+    by_title = {sheet.title.strip().lower(): sheet for sheet in sheets}
+    picked = {}
+    for i, name in enumerate(SOURCE_SHEETS):
+        sheet = by_title.get(name) or (sheets[i] if i < len(sheets) else None)
+        if sheet is None:
+            print(f"ERROR: {path} has no '{name}' sheet")
+            sys.exit(1)
+        picked[name] = sheet
+    return picked
+
+
+@contextlib.contextmanager
+def open_xlsx_source(path):
+    """Sheets of an .xlsx workbook, read with openpyxl."""
+    wb = open_workbook(path)
+    try:
+        yield pick_sheets(path, wb.worksheets)
+    finally:
+        wb.close()
+
+
+def ods_cell_value(cell):
+    """Typed value of an ODS table cell: int/float, bool, ISO date string, text or None."""
+    value_type = cell.get(ods_name("office", "value-type"))
+    if value_type in ("float", "percentage", "currency"):
+        number = float(cell.get(ods_name("office", "value")))
+        return int(number) if number.is_integer() else number
+    if value_type == "boolean":
+        return cell.get(ods_name("office", "boolean-value")) == "true"
+    if value_type == "date":
+        return cell.get(ods_name("office", "date-value"))
+    if value_type == "time":
+        return cell.get(ods_name("office", "time-value"))
+
+    # Direct children only: text:p inside an office:annotation is a comment
+    paragraphs = [ods_text(p) for p in cell.findall(ods_name("text", "p"))]
+    return "\n".join(paragraphs) if paragraphs else None
+
+
+def ods_text(elem):
+    """Text of an ODS paragraph, expanding the elements that stand for whitespace."""
+    parts = [elem.text or ""]
+    for child in elem:
+        if child.tag == ods_name("text", "s"):
+            parts.append(" " * int(child.get(ods_name("text", "c"), 1)))
+        elif child.tag == ods_name("text", "tab"):
+            parts.append("\t")
+        elif child.tag == ods_name("text", "line-break"):
+            parts.append("\n")
+        else:
+            parts.append(ods_text(child))
+        parts.append(child.tail or "")
+    return "".join(parts)
+
+
+def iter_ods_rows(path, index):
+    """Stream the rows of the index-th table in an .ods file.
+
+    content.xml is parsed incrementally and each row is dropped once read,
+    so memory stays flat however long the sheet is. Repeated cells and rows
+    are expanded, except the trailing blank runs spreadsheets pad with.
+    """
+    row_tag, table_tag = ods_name("table", "table-row"), ods_name("table", "table")
+    cell_tags = (ods_name("table", "table-cell"), ods_name("table", "covered-table-cell"))
+    repeated_columns = ods_name("table", "number-columns-repeated")
+    repeated_rows = ods_name("table", "number-rows-repeated")
+    with zipfile.ZipFile(path) as archive, archive.open("content.xml") as f:
+        table = -1
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            if elem.tag == table_tag:
+                if event == "start":
+                    table += 1
+                elif table == index:
+                    return
+                continue
+            if event != "end" or elem.tag != row_tag:
+                continue
+            if table == index:
+                values = []
+                blanks = 0
+                for cell in elem:
+                    if cell.tag not in cell_tags:
+                        continue
+                    value = ods_cell_value(cell)
+                    count = int(cell.get(repeated_columns, 1))
+                    if value is None:
+                        blanks += count
+                    else:
+                        values.extend([None] * blanks + [value] * count)
+                        blanks = 0
+                row = tuple(values)
+                for _ in range(int(elem.get(repeated_rows, 1)) if row else 1):
+                    yield row
+            elem.clear()
+
+
+def ods_sheet_titles(path):
+    """Titles of the tables in an .ods file, in order.
+
+    Stops as soon as every SOURCE_SHEETS title has been seen (all pick_sheets
+    needs); otherwise each element is dropped once parsed, so memory stays
+    flat while the rest of content.xml is scanned.
+    """
+    table_tag, name_attr = ods_name("table", "table"), ods_name("table", "name")
+    wanted = set(SOURCE_SHEETS)
+    titles = []
+    open_elems = []
+    with zipfile.ZipFile(path) as archive, archive.open("content.xml") as f:
+        for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+            if event == "end":
+                open_elems.pop()
+                if open_elems:
+                    del open_elems[-1][-1]
+                continue
+            open_elems.append(elem)
+            if elem.tag == table_tag:
+                titles.append(elem.get(name_attr, ""))
+                wanted.discard(titles[-1].strip().lower())
+                if not wanted:
+                    break
+    return titles
+
+
+@contextlib.contextmanager
+def open_ods_source(path):
+    """Sheets of an OpenDocument spreadsheet, streamed with the standard library."""
+    try:
+        titles = ods_sheet_titles(path)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as e:
+        print(f"ERROR: {path} is not a readable .ods file: {e}")
+        sys.exit(1)
+    yield pick_sheets(path, [
+        StreamedSheet(title, functools.partial(iter_ods_rows, path, i))
+        for i, title in enumerate(titles)
+    ])
+
+
+def iter_csv_rows(path):
+    """Stream a CSV file's rows, with empty cells as None like a workbook's."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.reader(f):
+            yield tuple(value if value != "" else None for value in row)
+
+
+def iter_jsonl_rows(path):
+    """Stream a JSON-lines file of objects as rows; the first object's keys are the header.
+
+    Keys may be field names or the workbook's header labels. A list value,
+    such as alternativeTo, is joined with commas as in the workbook.
+    """
+    header = None
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                obj = json.loads(line)
+            except ValueError as e:
+                print(f"ERROR: {path}:{number} is not valid JSON: {e}")
+                sys.exit(1)
+            if header is None:
+                header = list(obj)
+                yield tuple(header)
+            elif not obj.keys() <= set(header):
+                print(f"ERROR: {path}:{number} has keys missing from the first line: {', '.join(obj.keys() - set(header))}")
+                sys.exit(1)
+            yield tuple(", ".join(map(str, v)) if isinstance(v, list) else v
+                        for v in (obj.get(key) for key in header))
+
+
+@contextlib.contextmanager
+def open_sheet_files(path, ext):
+    """Sheets stored as one file per sheet, e.g. tools.csv and alternatives.csv."""
+    sheets = {}
+    for name, sheet_path in sheet_file_paths(path, ext).items():
+        if not os.path.isfile(sheet_path):
+            print(f"ERROR: {sheet_path} not found (expected {' and '.join(n + ext for n in SOURCE_SHEETS)})")
+            sys.exit(1)
+        sheets[name] = StreamedSheet(os.path.basename(sheet_path), functools.partial(SHEET_FILE_READERS[ext], sheet_path))
+    yield sheets
+
+
+def sheet_file_paths(path, ext):
+    """Map each sheet to its file in the source directory (or the given file's directory)."""
+    directory = path if os.path.isdir(path) else os.path.dirname(path)
+    return {name: os.path.join(directory, name + ext) for name in SOURCE_SHEETS}
+
+
+# Extension -> opener for single-file workbooks, or row reader for one-file-per-sheet sources
+WORKBOOK_READERS = {
+    ".xlsx": open_xlsx_source,
+    ".xlsm": open_xlsx_source,
+    ".ods": open_ods_source,
+}
+SHEET_FILE_READERS = {
+    ".csv": iter_csv_rows,
+    ".jsonl": iter_jsonl_rows,
+    ".ndjson": iter_jsonl_rows,
+}
+
+
+def source_format(path):
+    """File extension that selects the reader; a directory takes it from its tools.* file."""
+    if os.path.isdir(path):
+        for ext in SHEET_FILE_READERS:
+            if os.path.isfile(os.path.join(path, SOURCE_SHEETS[0] + ext)):
+                return ext
+        print(f"ERROR: {path} holds no {SOURCE_SHEETS[0]}.* sheet ({', '.join(SHEET_FILE_READERS)})")
+        sys.exit(1)
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in WORKBOOK_READERS and ext not in SHEET_FILE_READERS:
+        print(f"ERROR: unsupported source {path}; expected one of {', '.join([*WORKBOOK_READERS, *SHEET_FILE_READERS])}")
+        sys.exit(1)
+    return ext
+
+
+SOURCE_KINDS = {
+    ".xlsx": "xlsx workbook", ".xlsm": "xlsx workbook", ".ods": "ODS spreadsheet",
+    ".csv": "CSV sheets", ".jsonl": "JSON-lines sheets", ".ndjson": "JSON-lines sheets",
+}
+
+
+def source_label(path):
+    """Name the source for progress output, e.g. "fixtures/ (CSV sheets)"."""
+    return f"{path} ({SOURCE_KINDS[source_format(path)]})"
+
+
+def source_files(path):
+    """Every file the source at path is read from (for cache keys and --watch)."""
+    ext = source_format(path)
+    if ext in SHEET_FILE_READERS:
+        return list(sheet_file_paths(path, ext).values())
+    return [path]
+
+
+def open_source(path):
+    """Open a workbook, .ods or CSV / JSON-lines directory; a context manager of {sheet: worksheet}."""
+    ext = source_format(path)
+    if ext in SHEET_FILE_READERS:
+        return open_sheet_files(path, ext)
+    return WORKBOOK_READERS[ext](path)
+
+
+# ============================================================
+# Main
+# ============================================================
+
+def iter_sheet_values(ws):
+    """Yield each row's cell values, header first, until the first blank row."""
+    for vals in ws.iter_rows(values_only=True):
+        if not vals or all(v is None for v in vals):
+            break
+        yield vals
+
+
+def iter_tools(ws, errors=None):
+    """Yield tools from the tools sheet as dicts in internal format."""
+    for i, row in enumerate(iter_sheet_records(ws, "tools", errors)):
+        yield {"id": i + 1, **row}
+
+
+def iter_alternatives(ws, errors=None):
+    """Yield alternatives from the alternatives sheet as dicts in internal format."""
+    for i, row in enumerate(iter_sheet_records(ws, "alternatives", errors)):
+        # alternativeTo: split on commas and slugify each part
+        row["alternativeTo"] = slugify_all(
+            part.strip() for part in row["alternativeTo"].split(",") if part.strip())
+        yield {"id": i + 1, **row}
+
+
+def read_workbook(xlsx_path):
+    """Open the source once and return (tools, alternatives)."""
+    errors = []
+    with open_source(xlsx_path) as sheets:
+        tools = list(iter_tools(sheets["tools"], errors))
+        alternatives = list(iter_alternatives(sheets["alternatives"], errors))
+    if errors:
+        raise WorkbookInvalid(errors)
+    return tools, alternatives
+
+
+# ============================================================
+# Parsed Workbook Cache
+# ============================================================
+
+# Bump whenever iter_tools / iter_alternatives change what they produce,
+# so stale cache entries are never served.
+PARSER_VERSION = 3
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "techfreedom",
+)
+
+
+def workbook_cache_key(xlsx_path):
+    """Hash of the source files, the parser version, the slug rules, the sheet schemas and the archetype definitions."""
+    h = hashlib.sha256()
+    for path in source_files(xlsx_path):
+        h.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                h.update(chunk)
+    h.update(f"parser:{PARSER_VERSION}".encode())
+    if SLUG_SPECIAL_CASES is None:
+        load_slug_rules()
+    h.update(json.dumps(SLUG_SPECIAL_CASES, sort_keys=True).encode())
+    h.update(json.dumps([schema_fields("tools"), schema_fields("alternatives")], sort_keys=True).encode())
+    h.update(json.dumps(ARCHETYPES, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def clear_workbook_cache(cache_dir):
+    """Remove every cached workbook parse from cache_dir."""
+    removed = 0
+    if os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.startswith("workbook-") and name.endswith(".json"):
+                os.remove(os.path.join(cache_dir, name))
+                removed += 1
+    return removed
+
+
+def load_workbook_data(xlsx_path, cache_dir=None):
+    """Return (tools, alternatives), warning about names that share a slug."""
+    tools, alternatives = read_cached_workbook(xlsx_path, cache_dir)
+    for kind, rows in (("tools", tools), ("alternatives", alternatives)):
+        for slug, names in slug_collisions(rows).items():
+            print(f"  WARNING: {len(names)} {kind} share the slug '{slug}': {'; '.join(names)}")
+    return tools, alternatives
+
+
+def read_cached_workbook(xlsx_path, cache_dir=None):
+    """Return (tools, alternatives), served from cache_dir when the workbook is unchanged.
+
+    A cache hit never opens the source. Pass cache_dir=None to always parse.
+    """
+    if not cache_dir:
+        return read_workbook(xlsx_path)
+
+    key = workbook_cache_key(xlsx_path)
+    cache_path = os.path.join(cache_dir, f"workbook-{key}.json")
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            cached = json.load(f)
+        print("  Using cached parse of unchanged workbook")
+        return cached["tools"], cached["alternatives"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    tools, alternatives = read_workbook(xlsx_path)
+
+    # Only the latest parse is worth keeping
+    clear_workbook_cache(cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"tools": tools, "alternatives": alternatives}, f, ensure_ascii=False)
+    os.replace(tmp_path, cache_path)
+    return tools, alternatives
+
+
+def to_record(row):
+    """Convert a parsed row to the PocketBase record layout."""
+    data = {k: v for k, v in row.items() if k != "id"}
+    if isinstance(data.get("alternativeTo"), list):
+        # Stored as comma-separated slugs for consistent references
+        data["alternativeTo"] = ",".join(data["alternativeTo"])
+    return data
+
+
+# ============================================================
+# Scoring Engine
+# ============================================================
+
+def round_1dp(x):
+    """Round to one decimal place the way JavaScript's x.toFixed(1) does."""
+    from decimal import Decimal, ROUND_HALF_UP
+
+    return float(Decimal(x).quantize(Decimal("0.1"), rounding=ROUND_HALF_UP))
+
+
+def risk_category(average_total):
+    """Overall risk band for a stack's average total score (out of 25)."""
+    if average_total >= 18:
+        return "Critical"
+    if average_total >= 15:
+        return "High"
+    if average_total >= 11:
+        return "Moderate"
+    return "Low"
+
+
+def assess_stack(tools):
+    """Score a stack of tools the way the assess page's results view does.
+
+    Mirrors assessStack() in assess/index.html: per-dimension averages,
+    the overall risk category, the worst dimension and the tool driving
+    it, the most locked-in tool, and the Critical/High tool counts. Ties
+    go to the earliest dimension or tool, as in the browser.
+    """
+    n = len(tools)
+    averages = {dim: round_1dp(sum(t[dim] for t in tools) / n) for dim in DIMENSIONS}
+    average_total = round_1dp(sum(t["total"] for t in tools) / n)
+
+    worst_dim = DIMENSIONS[0]
+    for dim in DIMENSIONS:
+        if averages[dim] > averages[worst_dim]:
+            worst_dim = dim
+
+    worst_tool = tools[0]
+    most_locked_in = tools[0]
+    for t in tools:
+        if t[worst_dim] > worst_tool[worst_dim]:
+            worst_tool = t
+        if t["lockIn"] > most_locked_in["lockIn"]:
+            most_locked_in = t
+
+    return {
+        "toolCount": n,
+        "averages": averages,
+        "averageTotal": average_total,
+        "riskCategory": risk_category(average_total),
+        "worstDimension": worst_dim,
+        "worstTool": worst_tool["slug"],
+        "mostLockedIn": most_locked_in["slug"],
+        "criticalCount": sum(1 for t in tools if t["riskLevel"] == "Critical"),
+        "highCount": sum(1 for t in tools if t["riskLevel"] == "High"),
+    }
 
 
 def build_archetypes(tools):
-    """Build archetypes with toolSlugs referencing tools by slug."""
-    tool_slugs_set = {t["slug"] for t in tools}
+    """Build archetypes with toolSlugs referencing tools by slug, plus their precomputed assessment."""
+    tools_by_slug = {t["slug"]: t for t in tools}
     archetypes = []
 
     for arch in ARCHETYPES:
-        tool_slugs = [s for s in arch["tool_slugs"] if s in tool_slugs_set]
-        archetypes.append({
+        tool_slugs = [s for s in arch["tool_slugs"] if s in tools_by_slug]
+        archetype = {
             "name": arch["name"],
             "slug": arch["slug"],
             "description": arch["description"],
             "toolSlugs": tool_slugs,
-        })
+        }
+        if tool_slugs:
+            archetype["assessment"] = assess_stack([tools_by_slug[s] for s in tool_slugs])
+        archetypes.append(archetype)
 
     return archetypes
 
 
-def read_alternatives_from_xlsx(xlsx_path):
-    """Read alternatives from xlsx sheet[1] and return list of dicts in internal format."""
-    import openpyxl
+# ============================================================
+# Static Artefacts
+# ============================================================
 
-    wb = openpyxl.load_workbook(xlsx_path, data_only=True)
-    ws_alts = wb[wb.sheetnames[1]]
-    alternatives = []
+def write_file_atomic(path, payload):
+    """Replace path with payload bytes unless it already holds them; return True if written.
 
-    for i, row in enumerate(ws_alts.iter_rows(min_row=2)):
-        vals = [c.value for c in row]
-        if vals[0] is None:
-            break
+    The bytes go to a temporary file that is renamed over path, so a
+    server reading the directory never sees a half-written file.
+    """
+    try:
+        if os.path.getsize(path) == len(payload):
+            with open(path, "rb") as f:
+                if f.read() == payload:
+                    return False
+    except OSError:
+        pass
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+    return True
+
+
+def write_json(path, data, indent=2):
+    """Write JSON, pretty-printed by default as committed under assess/data/.
+
+    Returns True if the file changed.
+    """
+    if indent is None:
+        text = json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+    else:
+        text = json.dumps(data, indent=indent, ensure_ascii=False)
+    changed = write_file_atomic(path, text.encode("utf-8"))
+    print(f"  {'Wrote' if changed else 'Unchanged'} {path}")
+    return changed
+
+
+def minify_json(data):
+    """Serialise data as compact UTF-8 JSON bytes."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# Low-cardinality strings that are stored once and referenced by index
+DICT_FIELDS = ["category", "hqCountry", "riskLevel", "openSource", "selfHostable", "migrationDifficulty"]
+
+
+def to_columnar(rows):
+    """Encode a list of same-shaped dicts in the compact "columnar-v1" layout.
+
+    Each field becomes one array. Fields in DICT_FIELDS store indices into a
+    per-field table of distinct values. The five DIMENSIONS are packed
+    row-major into one digit string when every score is 0-9, and into a
+    flat number array otherwise. decodeColumnar() in the front-end rebuilds
+    the original objects, with keys in the original order.
+    """
+    fields = list(rows[0]) if rows else []
+    packed_fields = [f for f in DIMENSIONS if f in fields]
+    encoded = {"format": "columnar-v1", "length": len(rows), "fields": fields, "columns": {}, "dicts": {}}
+
+    for field in fields:
+        if field in packed_fields:
+            continue
+        values = [row[field] for row in rows]
+        if field in DICT_FIELDS:
+            table = list(dict.fromkeys(values))
+            index = {v: i for i, v in enumerate(table)}
+            encoded["dicts"][field] = table
+            values = [index[v] for v in values]
+        encoded["columns"][field] = values
+
+    if packed_fields:
+        scores = [row[f] for row in rows for f in packed_fields]
+        if all(isinstance(v, int) and 0 <= v <= 9 for v in scores):
+            scores = "".join(map(str, scores))
+        encoded["packed"] = {"fields": packed_fields, "data": scores}
+
+    return encoded
+
+
+def write_hashed_artefacts(output_dir, artefacts):
+    """Write minified, content-hashed copies of each artefact plus manifest.json.
+
+    Each logical name (e.g. "tools.json") becomes "tools.<hash>.json" with
+    matching .gz and, when the brotli module is installed, .br siblings, so
+    the CDN can cache them indefinitely. manifest.json maps logical names to
+    the hashed files and is the only file that must not be cached long-term.
+    Hashed files from earlier exports are removed. Returns the manifest,
+    which export_json also embeds in the pages (see update_manifest_html).
+    """
+    manifest = {"files": {}}
+    keep = {"manifest.json"}
+
+    for name, data in artefacts.items():
+        body = minify_json(data)
+        stem, ext = os.path.splitext(name)
+        hashed = f"{stem}.{hashlib.sha256(body).hexdigest()[:10]}{ext}"
+        manifest["files"][name] = hashed
+
+        filenames = [hashed, f"{hashed}.gz"] + ([f"{hashed}.br"] if brotli is not None else [])
+        keep.update(filenames)
+        if all(os.path.exists(os.path.join(output_dir, filename)) for filename in filenames):
+            # Same name, same content: nothing to compress again
+            print(f"  Unchanged {hashed}")
+            continue
+
+        variants = {hashed: body, f"{hashed}.gz": gzip.compress(body, 9, mtime=0)}
+        if brotli is not None:
+            variants[f"{hashed}.br"] = brotli.compress(body, quality=11)
+        for filename, payload in variants.items():
+            write_file_atomic(os.path.join(output_dir, filename), payload)
+        print(f"  Wrote {hashed} ({len(body)} bytes, {len(variants[f'{hashed}.gz'])} gzipped)")
+
+    remove_hashed_artefacts(output_dir, artefacts, keep)
+    write_json(os.path.join(output_dir, "manifest.json"), manifest)
+    if brotli is None:
+        print("  Note: brotli not installed, skipped .br files (pip3 install brotli)")
+    return manifest
+
+
+def read_manifest(output_dir):
+    """The "files" map of an earlier export's manifest.json, or None if there is none."""
+    try:
+        with open(os.path.join(output_dir, "manifest.json"), encoding="utf-8") as f:
+            files = json.load(f)["files"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    return files if isinstance(files, dict) else None
+
+
+def remove_hashed_artefacts(output_dir, names, keep=()):
+    """Delete this exporter's hashed files that are not in keep. Returns the number removed.
+
+    Only hashed copies of `names` (the logical names this run writes) and
+    files the previous manifest.json lists are touched, so other hashed
+    files in output_dir survive. With keep empty, that manifest goes too:
+    a plain export calls this so nothing keeps pointing the pages at an
+    older hashed tools.json.
+    """
+    previous = read_manifest(output_dir)
+    listed = set((previous or {}).values())
+    stems = sorted({os.path.splitext(name)[0] for name in (*names, *(previous or {}))})
+    owned = re.compile(r"^(%s)\.[0-9a-f]{10}\.json(\.gz|\.br)?$" % "|".join(map(re.escape, stems)))
+
+    removed = 0
+    for filename in os.listdir(output_dir):
+        if filename in keep:
+            continue
+        base = re.sub(r"\.(gz|br)$", "", filename)
+        if base in listed or (stems and owned.match(filename)) or (
+                not keep and previous is not None and filename == "manifest.json"):
+            os.remove(os.path.join(output_dir, filename))
+            removed += 1
+    return removed
 
-        name = str(vals[0])
-        slug = slugify(name)
 
-        # alternativeTo: split on commas and slugify each part
-        alt_to_raw = str(vals[2] or "")
-        alternative_to = [slugify(part.strip()) for part in alt_to_raw.split(",") if part.strip()]
-
-        alternatives.append({
-            "id": i + 1,
-            "name": name,
-            "slug": slug,
-            "category": str(vals[1] or ""),
-            "alternativeTo": alternative_to,
-            "provider": str(vals[3] or ""),
-            "hqCountry": str(vals[4] or ""),
-            "openSource": parse_bool_select(vals[5]),
-            "selfHostable": parse_bool_select(vals[6]),
-            "dataHosting": str(vals[7] or ""),
-            "jurisdiction": safe_int(vals[8]),
-            "continuity": safe_int(vals[9]),
-            "surveillance": safe_int(vals[10]),
-            "lockIn": safe_int(vals[11]),
-            "costExposure": safe_int(vals[12]),
-            "total": safe_int(vals[13]),
-            "approxCost": str(vals[14] or ""),
-            "migrationDifficulty": str(vals[15] or ""),
-            "tradeoffs": str(vals[16] or ""),
-            "lastReviewed": str(vals[17] or ""),
-        })
+# ============================================================
+# Sharded Bundles
+# ============================================================
+
+# What pages need before anything is selected: search, selection chips and
+# the alternatives page's tool headers. Everything else is in the shards.
+CATALOGUE_TOOL_FIELDS = ["id", "slug", "name", "category", "provider", "total", "riskLevel"]
+CATALOGUE_ALTERNATIVE_FIELDS = ["slug", "category"]
+
+# Shards are filled with whole category families up to at least this many
+# rows, so a small catalogue isn't split into a request per row or two
+SHARD_MIN_ROWS = 50
+
+SHARD_FILE_RE = re.compile(r"^(shard-.+?)(\.[0-9a-f]{10})?\.json(\.gz|\.br)?$")
+
+
+def build_shards(kind, rows, min_rows=SHARD_MIN_ROWS):
+    """Split rows into columnar shards of whole category families.
+
+    Families (see category_family) are packed in name order, and a shard is
+    closed once it holds min_rows rows; it is named after its first family.
+    Returns ({shard file name: columnar rows}, {category: shard file name}).
+    """
+    families = {}
+    for row in rows:
+        families.setdefault(category_family(row["category"]), []).append(row)
+
+    shards = {}
+    files = {}
+    chunk = []
+    name = None
+    for family in sorted(families):
+        name = name or f"shard-{kind}-{slugify(family) or 'other'}.json"
+        for row in families[family]:
+            files.setdefault(row["category"], name)
+        chunk.extend(families[family])
+        if len(chunk) >= min_rows:
+            shards[name] = to_columnar(chunk)
+            chunk, name = [], None
+    if chunk:
+        shards[name] = to_columnar(chunk)
+    return shards, files
+
+
+def build_catalogue(tools, alternatives, archetypes):
+    """Return (catalogue, shards) for the sharded static layout.
+
+    catalogue.json holds CATALOGUE_TOOL_FIELDS for every tool, each
+    alternative's category, the archetypes and the shard file for each
+    category. Pages fetch a shard only when they need its full rows.
+    """
+    tool_shards, tool_files = build_shards("tools", tools)
+    alt_shards, alt_files = build_shards("alternatives", alternatives)
+    catalogue = {
+        "version": 1,
+        "tools": to_columnar([{field: t[field] for field in CATALOGUE_TOOL_FIELDS} for t in tools]),
+        "alternatives": to_columnar([{field: a[field] for field in CATALOGUE_ALTERNATIVE_FIELDS} for a in alternatives]),
+        "archetypes": archetypes,
+        "shards": {"tools": tool_files, "alternatives": alt_files},
+    }
+    return catalogue, {**tool_shards, **alt_shards}
+
+
+def remove_stale_shards(output_dir, current):
+    """Delete shard files (plain or hashed) for categories no longer in `current`."""
+    for filename in os.listdir(output_dir):
+        match = SHARD_FILE_RE.match(filename)
+        if match and f"{match.group(1)}.json" not in current:
+            os.remove(os.path.join(output_dir, filename))
+
+
+# ============================================================
+# Embedded Fallback
+# ============================================================
+
+# What assess/index.html reads from a tool; hqCountry and dataHosting are never shown
+FALLBACK_TOOL_FIELDS = ["id", "name", "slug", "category", "provider", *DIMENSIONS, "total", "riskLevel", "keyRisks"]
+FALLBACK_ARCHETYPE_FIELDS = ["name", "slug", "description", "toolSlugs"]
+
+# The site the pages below belong to; they load their data from SITE_DATA_DIR
+SITE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SITE_DATA_DIR = os.path.join(SITE_ROOT, "assess", "data")
+DATA_PAGES = [
+    os.path.join(SITE_ROOT, "assess", "index.html"),
+    os.path.join(SITE_ROOT, "alternatives", "index.html"),
+]
+
+
+def data_pages(output_dir):
+    """DATA_PAGES to update for an export to output_dir: none unless it is SITE_DATA_DIR.
+
+    An export anywhere else is not what the pages load, so their embedded
+    copies are left as they are.
+    """
+    if os.path.realpath(output_dir) != os.path.realpath(SITE_DATA_DIR):
+        return []
+    return [path for path in DATA_PAGES if os.path.exists(path)]
+
+
+def generated_block_re(label):
+    """Pattern for the text between a page's BEGIN/END GENERATED <label> markers."""
+    return re.compile(r"/\* BEGIN GENERATED %s \*/\n(.*?)([ \t]*)/\* END GENERATED %s \*/" % (label, label), re.S)
+
 
-    return alternatives
+FALLBACK_BLOCK_RE = generated_block_re("FALLBACK")
+MANIFEST_BLOCK_RE = generated_block_re("MANIFEST")
 
 
-def export_json(xlsx_path, output_dir):
-    """Export tools.json and archetypes.json to output_dir."""
-    import os
+def js_literal(data):
+    """Compact JSON that is also safe to inline in a <script> element."""
+    text = minify_json(data).decode("utf-8")
+    return text.replace("</", "<\\/").replace("\u2028", "\\u2028").replace("\u2029", "\\u2029")
 
+
+def update_fallback_html(html_path, tools, archetypes):
+    """Regenerate the TOOLS_FALLBACK/ARCHETYPES_FALLBACK block of a page.
+
+    Only the text between the BEGIN/END GENERATED FALLBACK markers is
+    replaced. Tools are embedded in the columnar layout and rebuilt by
+    the page's decodeColumnar(). Pages without the markers are left
+    alone. Returns True if the page changed.
+    """
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    match = FALLBACK_BLOCK_RE.search(html)
+    if not match:
+        return False
+
+    indent = match.group(2)
+    tool_rows = [{field: t[field] for field in FALLBACK_TOOL_FIELDS} for t in tools]
+    arch_rows = [{field: a[field] for field in FALLBACK_ARCHETYPE_FIELDS} for a in archetypes]
+    block = (f"{indent}var TOOLS_FALLBACK = decodeColumnar({js_literal(to_columnar(tool_rows))});\n"
+             f"{indent}var ARCHETYPES_FALLBACK = {js_literal(arch_rows)};\n")
+
+    html = html[:match.start(1)] + block + html[match.end(1):]
+    changed = write_file_atomic(html_path, html.encode("utf-8"))
+    print(f"  {'Updated' if changed else 'Unchanged'} embedded fallback in {html_path}")
+    return changed
+
+
+def update_manifest_html(html_path, manifest):
+    """Embed manifest (or null after a plain export) as a page's STATIC_MANIFEST.
+
+    The page then resolves hashed file names without first fetching
+    manifest.json. Pages without the markers are left alone. Returns True
+    if the page changed.
+    """
+    with open(html_path, encoding="utf-8") as f:
+        html = f.read()
+    match = MANIFEST_BLOCK_RE.search(html)
+    if not match:
+        return False
+
+    value = js_literal(manifest) if manifest else "null"
+    block = f"{match.group(2)}var STATIC_MANIFEST = {value};\n"
+    html = html[:match.start(1)] + block + html[match.end(1):]
+    changed = write_file_atomic(html_path, html.encode("utf-8"))
+    print(f"  {'Updated' if changed else 'Unchanged'} embedded manifest in {html_path}")
+    return changed
+
+
+# ============================================================
+# Search Index
+# ============================================================
+
+SEARCH_FIELDS = ["name", "provider", "category"]
+
+
+def search_text(value):
+    """slugify's generic cleanup, keeping parentheticals so "Gmail" still finds Google Workspace."""
+    return NON_SLUG_RE.sub('-', str(value).lower()).strip('-')
+
+
+def build_search_index(tools):
+    """Build a trigram index over tool names, providers and categories.
+
+    Each searchable document is the search_text of its SEARCH_FIELDS plus
+    its slug, joined with "-". "docs" lists the tool slugs in export order
+    (only the assessment page searches). "grams" maps every
+    trigram to the ascending doc numbers that contain it. A query matches a
+    doc only if all the query's trigrams list that doc, so the client
+    intersects a few short lists instead of scanning every record. The
+    client still confirms the final match against the record itself.
+    """
+    docs = []
+    grams = {}
+    for row in tools:
+        doc = len(docs)
+        docs.append(row["slug"])
+        text = "-".join([search_text(row.get(f, "")) for f in SEARCH_FIELDS] + [row["slug"]])
+        for gram in {text[i:i + 3] for i in range(len(text) - 2)}:
+            grams.setdefault(gram, []).append(doc)
+    return {"version": 2, "docs": docs, "grams": dict(sorted(grams.items()))}
+
+
+# ============================================================
+# Alternatives Reverse Index
+# ============================================================
+
+def build_alternatives_index(tools, alternatives):
+    """Map each tool slug to the slugs of its alternatives, lowest total risk first.
+
+    alternativeTo entries go through SLUG_ALIASES, as on the alternatives
+    page. Returns (index, dangling). `index` holds only tools that have
+    alternatives. `dangling` maps each slug that resolves to no tool to the
+    alternatives that reference it.
+    """
+    tool_slugs = {t["slug"] for t in tools}
+    linked = {}
+    dangling = {}
+
+    for alt in alternatives:
+        for ref in alt["alternativeTo"]:
+            slug = SLUG_ALIASES.get(ref, ref)
+            if slug not in tool_slugs:
+                dangling.setdefault(ref, []).append(alt["slug"])
+                continue
+            entries = linked.setdefault(slug, [])
+            if alt not in entries:
+                entries.append(alt)
+
+    index = {
+        slug: [a["slug"] for a in sorted(linked[slug], key=lambda a: a["total"])]
+        for slug in (t["slug"] for t in tools) if slug in linked
+    }
+    return index, dangling
+
+
+NEAREST_K = 3
+
+
+def category_family(category):
+    """Leading part of a category label, so "Forms" matches "Forms / Surveys"."""
+    return re.split(r"[/&]", category.lower())[0].strip()
+
+
+# Families with fewer score vectors than this are searched exhaustively
+NEAREST_WALK_MIN_VECTORS = 64
+
+
+@functools.lru_cache(maxsize=None)
+def lattice_levels(span):
+    """Integer offsets in [-span, span]^5, grouped by squared length, shortest first."""
+    levels = {}
+    for offset in itertools.product(range(-span, span + 1), repeat=len(DIMENSIONS)):
+        levels.setdefault(sum(o * o for o in offset), []).append(offset)
+    return sorted(levels.items())
+
+
+def lower_risk_groups(groups, total, k):
+    """The k lowest-total alternatives of each score vector in groups that score below total."""
+    eligible = {}
+    for vector, alts in groups.items():
+        lower = list(itertools.islice(itertools.takewhile(lambda a: a["total"] < total, alts), k))
+        if lower:
+            eligible[vector] = lower
+    return eligible
+
+
+def nearest_lower(point, eligible, k, span):
+    """(squared distance, total, slug) of the k alternatives in eligible nearest to point.
+
+    In a dense family the lattice around point is walked outwards one
+    distance level at a time, stopping at the first level that completes
+    k candidates; a sparse one, or a walk that has already looked at as
+    many cells as there are vectors, is scanned in full instead.
+    """
+    if len(eligible) >= NEAREST_WALK_MIN_VECTORS:
+        candidates = []
+        visited = 0
+        for squared, offsets in lattice_levels(span):
+            for offset in offsets:
+                alts = eligible.get(tuple(p + o for p, o in zip(point, offset)))
+                if alts:
+                    candidates.extend((squared, a["total"], a["slug"]) for a in alts)
+            if len(candidates) >= k:
+                return heapq.nsmallest(k, candidates)
+            visited += len(offsets)
+            if visited >= len(eligible):
+                break
+
+    candidates = []
+    for vector, alts in eligible.items():
+        squared = sum((p - v) ** 2 for p, v in zip(point, vector))
+        candidates.extend((squared, a["total"], a["slug"]) for a in alts)
+    return heapq.nsmallest(k, candidates)
+
+
+def build_nearest_alternatives(tools, alternatives, k=NEAREST_K, same_category=False):
+    """Map each tool slug to its k nearest lower-risk alternatives, nearest first.
+
+    Distance is Euclidean over the five DIMENSIONS, and only alternatives
+    with a lower total than the tool qualify. Ties go to the lower total,
+    then the slug. With same_category, only alternatives whose
+    category_family() matches the tool's are considered.
+
+    The answer only depends on the tool's family, score vector and total.
+    Each family's qualifying alternatives are gathered once per total (at
+    most 21 of them), and each distinct (family, vector, total) is
+    searched once and shared by every tool that has it.
+    """
+    if not k:
+        return {}
+    groups = {}
+    for alt in sorted(alternatives, key=lambda a: (a["total"], a["slug"])):
+        family = category_family(alt["category"]) if same_category else None
+        vector = tuple(alt[dim] for dim in DIMENSIONS)
+        groups.setdefault(family, {}).setdefault(vector, []).append(alt)
+
+    values = [row[dim] for row in itertools.chain(tools, alternatives) for dim in DIMENSIONS]
+    span = int(max(values) - min(values)) if values else 0
+
+    nearest = {}
+    eligible = {}
+    found = {}
+    for tool in tools:
+        family = category_family(tool["category"]) if same_category else None
+        point = tuple(tool[dim] for dim in DIMENSIONS)
+        key = (family, point, tool["total"])
+        if key not in found:
+            if (family, tool["total"]) not in eligible:
+                eligible[family, tool["total"]] = lower_risk_groups(groups.get(family, {}), tool["total"], k)
+            best = nearest_lower(point, eligible[family, tool["total"]], k, span)
+            found[key] = [slug for _, _, slug in best]
+        if found[key]:
+            nearest[tool["slug"]] = found[key]
+    return nearest
+
+
+# ============================================================
+# Assessment Analytics
+# ============================================================
+
+# Score histograms use half-point buckets from 0 to 5 (totals: whole points to 25)
+SCORE_BUCKET = 0.5
+TOTAL_BUCKET = 1
+
+
+class ScoreDistribution:
+    """Running count/mean/min/max and fixed-width histogram for one score."""
+
+    def __init__(self, maximum, bucket):
+        self.bucket = bucket
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = [0] * (int(maximum / bucket) + 1)
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        i = min(max(int(value / self.bucket), 0), len(self.histogram) - 1)
+        self.histogram[i] += 1
+
+    def to_json(self):
+        return {
+            "count": self.count,
+            "mean": round_1dp(self.total / self.count) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "bucket": self.bucket,
+            "histogram": self.histogram,
+        }
+
+
+def score_value(scores, key):
+    """Read one numeric score from an assessment's scores JSON, or None."""
+    if not isinstance(scores, dict):
+        return None
+    value = scores.get(key)
+    if value is None and isinstance(scores.get("averages"), dict):
+        value = scores["averages"].get(key)
+    if value is None and key == "total":
+        value = scores.get("averageTotal")
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def aggregate_assessments(records, tool_id_to_slug, top_pairs=200):
+    """Fold a stream of assessment records into popularity, co-occurrence and score statistics.
+
+    Works in a single pass. Memory depends only on the size of the tool
+    catalogue, never on the number of assessments. Tool ids with no
+    matching slug (deleted tools) are counted under "unknownTools".
+    """
+    n = 0
+    unknown = 0
+    popularity = {}
+    pairs = {}
+    distributions = {dim: ScoreDistribution(5, SCORE_BUCKET) for dim in DIMENSIONS}
+    distributions["total"] = ScoreDistribution(25, TOTAL_BUCKET)
+
+    for record in records:
+        n += 1
+        slugs = []
+        for tool_id in dict.fromkeys(record.get("tools") or []):
+            slug = tool_id_to_slug.get(tool_id)
+            if slug is None:
+                unknown += 1
+            else:
+                slugs.append(slug)
+        slugs.sort()
+
+        for i, a in enumerate(slugs):
+            popularity[a] = popularity.get(a, 0) + 1
+            for b in slugs[i + 1:]:
+                pairs[(a, b)] = pairs.get((a, b), 0) + 1
+
+        scores = record.get("scores")
+        for key, dist in distributions.items():
+            value = score_value(scores, key)
+            if value is not None:
+                dist.add(value)
+
+    ranked_pairs = sorted(pairs.items(), key=lambda kv: (-kv[1], kv[0]))[:top_pairs]
+    return {
+        "assessments": n,
+        "unknownTools": unknown,
+        "toolPopularity": dict(sorted(popularity.items(), key=lambda kv: (-kv[1], kv[0]))),
+        "toolPairs": [[a, b, count] for (a, b), count in ranked_pairs],
+        "scores": {key: dist.to_json() for key, dist in distributions.items()},
+    }
+
+
+def export_analytics(pb, output_path, per_page=500):
+    """Stream every assessment out of PocketBase and write the aggregate as compact JSON."""
+    from datetime import datetime, timezone
+
+    tool_id_to_slug = {r["id"]: r["slug"] for r in pb.list_records("tools", fields=["id", "slug"])}
+    print(f"  Loaded {len(tool_id_to_slug)} tool ids")
+
+    records = pb.list_records("assessments", per_page=per_page, fields=["tools", "scores"], sort="created")
+    analytics = aggregate_assessments(records, tool_id_to_slug)
+    analytics["generated"] = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    print(f"  Aggregated {analytics['assessments']} assessments")
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    write_json(output_path, analytics, indent=None)
+
+
+# ============================================================
+# Offline SQLite Seeding
+# ============================================================
+
+# PocketBase keeps collection definitions in _collections. Up to 0.22 its
+# "schema" column lists the fields with their options nested; 0.23+ (setup.sh
+# installs 0.25.x) names the column "fields" and uses the pb_fields() format,
+# with the id column as an explicit system field.
+PB_ID_FIELD = {
+    "id": "text3208210256", "name": "id", "type": "text", "system": True, "primaryKey": True,
+    "required": True, "hidden": False, "presentable": False,
+    "min": 15, "max": 15, "pattern": "^[a-z0-9]+$", "autogeneratePattern": "[a-z0-9]{15}",
+}
+
+# Layout of PocketBase's _collections table ({fields_column} is "schema" before
+# 0.23), created only when seeding a scratch database that PocketBase itself
+# has never opened.
+PB_COLLECTIONS_DDL = """
+CREATE TABLE IF NOT EXISTS _collections (
+    id TEXT PRIMARY KEY NOT NULL,
+    system BOOLEAN DEFAULT FALSE NOT NULL,
+    type TEXT DEFAULT 'base' NOT NULL,
+    name TEXT UNIQUE NOT NULL,
+    {fields_column} JSON DEFAULT '[]' NOT NULL,
+    indexes JSON DEFAULT '[]' NOT NULL,
+    listRule TEXT DEFAULT NULL,
+    viewRule TEXT DEFAULT NULL,
+    createRule TEXT DEFAULT NULL,
+    updateRule TEXT DEFAULT NULL,
+    deleteRule TEXT DEFAULT NULL,
+    options JSON DEFAULT '{{}}' NOT NULL,
+    created TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%fZ')) NOT NULL,
+    updated TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%fZ')) NOT NULL
+)
+"""
+
+def pb_now():
+    """Current time in PocketBase's stored datetime format."""
+    from datetime import datetime, timezone
+
+    return datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3] + "Z"
+
+
+def is_multiple(field):
+    """Whether a relation field holds a list (PocketBase: maxSelect unset or > 1)."""
+    max_select = field.get("options", {}).get("maxSelect")
+    return field["type"] == "relation" and (max_select is None or max_select > 1)
+
+
+def sqlite_column(field):
+    """Column definition PocketBase uses for a schema field."""
+    name = field["name"]
+    if field["type"] == "number":
+        return f'"{name}" NUMERIC DEFAULT 0 NOT NULL'
+    if field["type"] == "bool":
+        return f'"{name}" BOOLEAN DEFAULT FALSE NOT NULL'
+    if field["type"] == "json":
+        return f'"{name}" JSON DEFAULT NULL'
+    if is_multiple(field):
+        return f'"{name}" JSON DEFAULT \'[]\' NOT NULL'
+    return f'"{name}" TEXT DEFAULT \'\' NOT NULL'
+
+
+def sqlite_value(field, value):
+    """Convert a record value to what PocketBase stores in the field's column."""
+    if field["type"] == "json":
+        return None if value is None else json.dumps(value)
+    if is_multiple(field):
+        return json.dumps(list(value or []))
+    if field["type"] in ("number", "bool"):
+        return value or 0
+    return "" if value is None else str(value)
+
+
+def stored_fields(payload):
+    """The "fields" JSON PocketBase 0.23+ stores for a collection_payload(fields_layout=True)."""
+    fields = [dict(PB_ID_FIELD)]
+    for field in payload["fields"]:
+        fields.append({
+            "id": f"{field['type']}{random.randrange(10 ** 9, 10 ** 10)}",
+            "system": False,
+            "hidden": False,
+            "presentable": False,
+            **field,
+        })
+    return fields
+
+
+def seed_collection(db, coll_def, collection_ids, now, fields_layout):
+    """Insert a collection definition and create its records table. Returns the collection id.
+
+    The table has id, created and updated columns plus one per schema
+    field in either layout; fields_layout picks how _collections stores it.
+    """
+    payload = collection_payload(coll_def, collection_ids, fields_layout)
+    row = db.execute("SELECT id FROM _collections WHERE name = ?", (payload["name"],)).fetchone()
+    if row:
+        print(f"  '{payload['name']}' already exists, skipping")
+        return row[0]
+
+    collection_id = pb_id()
+    if fields_layout:
+        db.execute(
+            "INSERT INTO _collections (id, system, type, name, fields, indexes, listRule, viewRule,"
+            " createRule, updateRule, deleteRule, options, created, updated)"
+            " VALUES (?, FALSE, ?, ?, ?, '[]', ?, ?, ?, ?, ?, '{}', ?, ?)",
+            (collection_id, payload["type"], payload["name"], json.dumps(stored_fields(payload)),
+             payload["listRule"], payload["viewRule"], payload["createRule"],
+             payload["updateRule"], payload["deleteRule"], now, now),
+        )
+        create_records_table(db, payload["name"], coll_def["schema"])
+        print(f"  Created '{payload['name']}' (id: {collection_id})")
+        return collection_id
+
+    schema = []
+    for field in payload["schema"]:
+        options = dict(field.get("options", {}))
+        if field["type"] == "select":
+            options.setdefault("maxSelect", 1)
+        schema.append({
+            "system": False,
+            "id": pb_id(8),
+            "name": field["name"],
+            "type": field["type"],
+            "required": field.get("required", False),
+            "presentable": False,
+            "unique": False,
+            "options": options,
+        })
+
+    db.execute(
+        "INSERT INTO _collections (id, system, type, name, schema, indexes, listRule, viewRule,"
+        " createRule, updateRule, deleteRule, options, created, updated)"
+        " VALUES (?, FALSE, ?, ?, ?, '[]', ?, ?, ?, ?, ?, '{}', ?, ?)",
+        (collection_id, payload["type"], payload["name"], json.dumps(schema),
+         payload["listRule"], payload["viewRule"], payload["createRule"],
+         payload["updateRule"], payload["deleteRule"], now, now),
+    )
+    create_records_table(db, payload["name"], payload["schema"])
+    db.execute(f'CREATE INDEX "_{collection_id}_created_idx" ON "{payload["name"]}" (created)')
+    print(f"  Created '{payload['name']}' (id: {collection_id})")
+    return collection_id
+
+
+def create_records_table(db, name, schema):
+    """Create a collection's records table: id, created, updated and a column per schema field."""
+    columns = ",\n    ".join(sqlite_column(f) for f in schema)
+    db.execute(
+        f'CREATE TABLE "{name}" (\n'
+        "    id TEXT PRIMARY KEY DEFAULT ('r'||lower(hex(randomblob(7)))) NOT NULL,\n"
+        "    created TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%fZ')) NOT NULL,\n"
+        "    updated TEXT DEFAULT (strftime('%Y-%m-%d %H:%M:%fZ')) NOT NULL,\n"
+        f"    {columns}\n)"
+    )
+
+
+def check_seed_target(db):
+    """Return whether data.db uses the 0.23+ "fields" layout; exit if seeding it would be unsafe.
+
+    Unknown _collections layouts are refused. So are collections that
+    already hold records: seeding inserts fresh records with new ids, so
+    running it twice would duplicate every tool; use the HTTP import
+    (--sync) to update a live server.
+    """
+    columns = {row[1] for row in db.execute("PRAGMA table_info(_collections)")}
+    if "fields" not in columns and "schema" not in columns:
+        print("  ERROR: _collections has neither a 'fields' (PocketBase 0.23+) nor a 'schema' (0.22) column.")
+        sys.exit(1)
+
+    for coll_def in COLLECTIONS:
+        exists = db.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                            (coll_def["name"],)).fetchone()
+        if exists and db.execute(f'SELECT 1 FROM "{coll_def["name"]}" LIMIT 1').fetchone():
+            print(f"  ERROR: '{coll_def['name']}' already has records; --seed-sqlite only fills empty collections.")
+            print("         Use --sync against the running server to update existing data.")
+            sys.exit(1)
+    return "fields" in columns
+
+
+def seed_records(db, coll_def, rows, now):
+    """Insert rows into a collection's table. Returns {row key: record id}."""
+    fields = coll_def["schema"]
+    columns = ", ".join(["id", "created", "updated"] + [f'"{f["name"]}"' for f in fields])
+    placeholders = ", ".join("?" * (len(fields) + 3))
+    ids = {}
+    params = []
+    for data in rows:
+        record_id = pb_id()
+        ids[record_key(data)] = record_id
+        params.append([record_id, now, now] + [sqlite_value(f, data.get(f["name"])) for f in fields])
+    db.executemany(f'INSERT INTO "{coll_def["name"]}" ({columns}) VALUES ({placeholders})', params)
+    return ids
+
+
+def seed_sqlite(db_path, tools, alternatives):
+    """Write collection schemas and all seed records straight into a PocketBase data.db.
+
+    Everything happens in one transaction, so a failure leaves the database
+    untouched. PocketBase must not be running against the same file. Both
+    the 0.22 and the 0.23+ storage layouts are written, but only into empty
+    collections (see check_seed_target). A missing _collections table is
+    created in the 0.23+ layout that setup.sh's PocketBase uses; that is
+    only meant for scratch databases and test fixtures: real ones should be
+    initialised by starting PocketBase once first.
+    """
+    import sqlite3
+
+    definitions = {c["name"]: c for c in COLLECTIONS}
+    now = pb_now()
+    db = sqlite3.connect(db_path, isolation_level=None)
+    try:
+        db.execute("BEGIN IMMEDIATE")
+        db.execute(PB_COLLECTIONS_DDL.format(fields_column="fields"))
+        fields_layout = check_seed_target(db)
+
+        collection_ids = {}
+        for coll_def in COLLECTIONS:
+            collection_ids[coll_def["name"]] = seed_collection(db, coll_def, collection_ids, now, fields_layout)
+
+        tool_slug_to_id = seed_records(db, definitions["tools"], [to_record(t) for t in tools], now)
+        print(f"  Seeded {len(tool_slug_to_id)} tools")
+        seed_records(db, definitions["alternatives"], [to_record(a) for a in alternatives], now)
+        print(f"  Seeded {len(alternatives)} alternatives")
+        seed_records(db, definitions["archetypes"], archetype_records(tool_slug_to_id), now)
+        print(f"  Seeded {len(ARCHETYPES)} archetypes")
+        seed_records(db, definitions["scoring_guide"], SCORING_GUIDE, now)
+        print(f"  Seeded {len(SCORING_GUIDE)} scoring guide entries")
+
+        db.execute("COMMIT")
+    except BaseException:
+        db.execute("ROLLBACK")
+        raise
+    finally:
+        db.close()
+
+
+def export_json(xlsx_path, output_dir, cache_dir=None, hashed=False, columnar=False,
+                nearest_k=NEAREST_K, same_category=True, sharded=False):
+    """Export tools, archetypes and alternatives JSON plus derived indexes to output_dir.
+
+    With hashed=True, also write minified content-hashed copies and a manifest;
+    without it, remove those left by an earlier hashed export. When output_dir
+    is the site's own assess/data, the DATA_PAGES also get the embedded
+    fallback and the current manifest (or none); see data_pages.
+    With columnar=True, the hashed tools and alternatives use to_columnar().
+    nearest_k and same_category are passed to build_nearest_alternatives();
+    nearest_k=0 leaves the "nearest" lists out of alternatives-index.json.
+    With sharded=True, also write catalogue.json and category shards
+    (see build_catalogue) for pages with STATIC_LAYOUT = 'sharded'.
+    """
     os.makedirs(output_dir, exist_ok=True)
 
-    print("\nReading xlsx...")
-    tools = read_tools_from_xlsx(xlsx_path)
+    print(f"\nReading {source_label(xlsx_path)}...")
+    with PROFILE.phase("source load"):
+        tools, alternatives = load_workbook_data(xlsx_path, cache_dir)
     print(f"  Found {len(tools)} tools")
 
-    archetypes = build_archetypes(tools)
+    with PROFILE.phase("archetype scoring"):
+        archetypes = build_archetypes(tools)
     print(f"  Built {len(archetypes)} archetypes")
-
-    alternatives = read_alternatives_from_xlsx(xlsx_path)
     print(f"  Found {len(alternatives)} alternatives")
 
-    tools_path = os.path.join(output_dir, "tools.json")
-    with open(tools_path, "w", encoding="utf-8") as f:
-        json.dump(tools, f, indent=2, ensure_ascii=False)
-    print(f"  Wrote {tools_path}")
+    # The static tools.json has never carried lastReviewed
+    tools = [{k: v for k, v in t.items() if k != "lastReviewed"} for t in tools]
+
+    artefacts = {
+        "tools.json": tools,
+        "archetypes.json": archetypes,
+        "alternatives.json": alternatives,
+    }
+    with PROFILE.phase("JSON write"):
+        for name, data in artefacts.items():
+            write_json(os.path.join(output_dir, name), data)
+
+    with PROFILE.phase("index build"):
+        alternatives_index, dangling = build_alternatives_index(tools, alternatives)
+        search_index = build_search_index(tools)
+        nearest = build_nearest_alternatives(tools, alternatives, nearest_k, same_category) if nearest_k else {}
+    for ref, alt_slugs in sorted(dangling.items()):
+        print(f"  WARNING: alternativeTo '{ref}' matches no tool (used by {', '.join(alt_slugs)})")
+
+    # Derived lookup structures, written compact since nobody reads them by eye
+    indexes = {
+        "search-index.json": search_index,
+        "alternatives-index.json": {"version": 1, "tools": alternatives_index, "nearest": nearest},
+    }
+    with PROFILE.phase("index write"):
+        for name, data in indexes.items():
+            write_json(os.path.join(output_dir, name), data, indent=None)
+    artefacts.update(indexes)
+
+    if sharded:
+        with PROFILE.phase("shards"):
+            catalogue, shards = build_catalogue(tools, alternatives, archetypes)
+            bundles = {"catalogue.json": catalogue, **shards}
+            for name, data in bundles.items():
+                write_json(os.path.join(output_dir, name), data, indent=None)
+            remove_stale_shards(output_dir, bundles)
+        print(f"  {len(shards)} shards")
+        artefacts.update(bundles)
+
+    pages = data_pages(output_dir)
+    if not pages:
+        print(f"  Pages not updated: they load their data from {os.path.relpath(SITE_DATA_DIR)}")
+    # assess/index.html embeds a copy for offline use
+    with PROFILE.phase("fallback html"):
+        for html_path in pages:
+            update_fallback_html(html_path, tools, archetypes)
+
+    manifest = None
+    if hashed:
+        print("\nWriting hashed artefacts...")
+        if columnar:
+            artefacts["tools.json"] = to_columnar(tools)
+            artefacts["alternatives.json"] = to_columnar(alternatives)
+        with PROFILE.phase("hashed artefacts"):
+            manifest = write_hashed_artefacts(output_dir, artefacts)
+    else:
+        removed = remove_hashed_artefacts(output_dir, artefacts)
+        if removed:
+            print(f"  Removed {removed} file(s) left by an earlier --hashed export, manifest.json included")
+    # The pages carry the manifest themselves, so they never wait on manifest.json
+    for html_path in pages:
+        update_manifest_html(html_path, manifest)
 
-    archetypes_path = os.path.join(output_dir, "archetypes.json")
-    with open(archetypes_path, "w", encoding="utf-8") as f:
-        json.dump(archetypes, f, indent=2, ensure_ascii=False)
-    print(f"  Wrote {archetypes_path}")
+    print("\nDone! Static JSON files ready for deployment.")
 
-    alternatives_path = os.path.join(output_dir, "alternatives.json")
-    with open(alternatives_path, "w", encoding="utf-8") as f:
-        json.dump(alternatives, f, indent=2, ensure_ascii=False)
-    print(f"  Wrote {alternatives_path}")
 
-    print("\nDone! Static JSON files ready for deployment.")
+# ============================================================
+# Watch Mode
+# ============================================================
+
+WATCH_INTERVAL = 1.0  # Seconds between polls
+
+
+def file_stamp(path):
+    """(mtime, size) of path, or None while it is missing (e.g. mid-save)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def watch_export(xlsx_path, output_dir, cache_dir, slug_rules, **export_options):
+    """Run export_json, then again whenever the workbook or slug rules change.
+
+    ARCHETYPES live in this script, so saving it restarts the process to
+    pick up the new definitions. write_json leaves unchanged artefacts
+    alone and replaces changed ones atomically, so a preview server never
+    sees a half-written file.
+    """
+    script = os.path.abspath(__file__)
+    sources = source_files(xlsx_path)
+    watched = [*sources, slug_rules, script]
+
+    def export(changed):
+        try:
+            if slug_rules in changed:
+                load_slug_rules(slug_rules)
+            export_json(xlsx_path, output_dir, cache_dir, **export_options)
+        except WorkbookInvalid as e:
+            print_validation_errors(e.errors)
+            print("  Fix the cells above and save again")
+        except (Exception, SystemExit) as e:
+            # Typically a workbook caught mid-save; the next save triggers a retry
+            print(f"  Export failed, waiting for the next change: {e}")
+
+    stamps = {path: file_stamp(path) for path in watched}
+    export([])
+    print(f"\nWatching {xlsx_path} for changes (Ctrl+C to stop)...")
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = {path: file_stamp(path) for path in watched}
+            if current == stamps:
+                continue
+            # Spreadsheet apps save in several steps, so wait for the files to settle
+            while True:
+                time.sleep(WATCH_INTERVAL)
+                settled = {path: file_stamp(path) for path in watched}
+                if settled == current:
+                    break
+                current = settled
+
+            changed = [path for path in watched if current[path] != stamps[path]]
+            stamps = current
+            if script in changed:
+                print(f"\n{os.path.basename(script)} changed, restarting to load the new archetypes...")
+                sys.stdout.flush()
+                os.execv(sys.executable, [sys.executable] + sys.argv)
+            missing = [path for path in sources if current[path] is None]
+            if missing:
+                print(f"\n{', '.join(missing)} missing, waiting for it to reappear...")
+                continue
+
+            print(f"\nChanged: {', '.join(os.path.basename(path) for path in changed)}")
+            export(changed)
+            print(f"\nWatching {xlsx_path} for changes (Ctrl+C to stop)...")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
 
 
 def main():
@@ -490,201 +2998,257 @@ def main():
     parser.add_argument("--url", help="PocketBase URL (e.g. https://api.techfreedom.eu)")
     parser.add_argument("--email", help="Admin email")
     parser.add_argument("--password", help="Admin password")
-    parser.add_argument("--xlsx", required=True, help="Path to techfreedom-database.xlsx")
+    parser.add_argument("--xlsx", "--source", dest="xlsx", help="Path to techfreedom-database.xlsx, an .ods copy, or a directory of tools/alternatives .csv or .jsonl files (required except with --export-analytics)")
     parser.add_argument("--export-json", metavar="DIR", help="Export tools.json and archetypes.json to DIR (no PocketBase needed)")
+    parser.add_argument("--seed-sqlite", metavar="DB", help="Write collections and records straight into a stopped PocketBase's pb_data/data.db"
+                             " (PocketBase 0.22 or 0.23+ storage layout; refuses non-empty collections)")
+    parser.add_argument("--export-analytics", metavar="FILE", help="Stream all assessments from PocketBase and write aggregate analytics JSON to FILE")
+    parser.add_argument("--watch", action="store_true", help="With --export-json, keep running and re-export whenever the workbook, slug rules or archetypes change")
+    parser.add_argument("--hashed", action="store_true", help="With --export-json, also write minified content-hashed files (+ .gz/.br) and manifest.json")
+    parser.add_argument("--columnar", action="store_true", help="With --hashed, encode the hashed tools and alternatives in the compact columnar layout")
+    parser.add_argument("--sharded", action="store_true", help="With --export-json, also write catalogue.json and shard-*.json files of whole categories for lazy loading")
+    parser.add_argument("--nearest", type=int, default=NEAREST_K, metavar="K", help=f"With --export-json, list the K closest lower-risk alternatives per tool by score (default: {NEAREST_K}; 0 disables)")
+    parser.add_argument("--nearest-any-category", action="store_true", help="Let nearest alternatives come from any category, not just the tool's own")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, metavar="DIR", help=f"Where parsed workbooks are cached (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--no-cache", action="store_true", help="Always parse the xlsx, ignoring and not writing the cache")
+    parser.add_argument("--clear-cache", action="store_true", help="Delete cached workbook parses before running")
+    parser.add_argument("--validation-report", metavar="FILE", help="If the workbook fails schema validation, write every invalid cell to FILE as JSON")
+    parser.add_argument("--slug-rules", default=SLUG_RULES_PATH, metavar="FILE", help="JSON table of slug special cases (default: slug-rules.json beside this script)")
     parser.add_argument("--skip-collections", action="store_true", help="Skip collection creation")
     parser.add_argument("--skip-import", action="store_true", help="Skip data import")
+    parser.add_argument("--workers", type=int, default=1, metavar="N", help="Concurrent record writes per collection (default: 1)")
+    parser.add_argument("--sync", action="store_true", help="Upsert by slug: create new rows, patch changed ones, leave the rest")
+    parser.add_argument("--prune", action="store_true", help="With --sync, delete stored records that are no longer in the workbook")
+    parser.add_argument("--journal", default="import-journal.jsonl", metavar="FILE", help="Checkpoint journal of completed writes, removed after a clean run (default: import-journal.jsonl)")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted import: skip writes already in --journal")
+    parser.add_argument("--plan", action="store_true", help="Dry run: read the live collections and records, print what the import would create, update and delete, and stop")
+    parser.add_argument("--plan-json", metavar="FILE", help="With --plan, also write the plan to FILE as JSON")
+    parser.add_argument("--batch-size", type=int, default=0, metavar="N", help="Send record creates as transactional batches of N via /api/batch (PocketBase >= 0.23; 0 disables)")
+    parser.add_argument("--timeout", type=float, default=30, metavar="SECONDS", help="Per-request read timeout (default: 30)")
+    parser.add_argument("--retries", type=int, default=4, metavar="N", help="Retries for throttled (429), failed (5xx) or timed-out requests (default: 4)")
+    parser.add_argument("--profile", action="store_true", help="Report wall/CPU time per phase, latency per endpoint and peak memory at the end")
+    parser.add_argument("--profile-out", metavar="FILE", help="With --profile, also write cProfile stats of the main thread to FILE (view with python3 -m pstats FILE)")
     args = parser.parse_args()
 
+    if args.profile_out and not args.profile:
+        parser.error("--profile-out requires --profile")
+
+    profiler = None
+    if args.profile_out:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        run(args, parser)
+    except WorkbookInvalid as e:
+        print_validation_errors(e.errors)
+        if args.validation_report:
+            write_validation_report(args.validation_report, args.xlsx, e.errors)
+        sys.exit(1)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.profile_out)
+        if args.profile:
+            PROFILE.report()
+            if profiler:
+                print(f"  cProfile stats written to {args.profile_out}")
+
+
+def run(args, parser):
+    """Carry out the mode selected on the command line."""
+    if args.slug_rules != SLUG_RULES_PATH:
+        load_slug_rules(args.slug_rules)
+
+    if not args.xlsx and not args.export_analytics:
+        parser.error("--xlsx is required (except with --export-analytics)")
+
     # ---- Static JSON export mode ----
+    cache_dir = None if args.no_cache else args.cache_dir
+    if args.clear_cache:
+        removed = clear_workbook_cache(args.cache_dir)
+        print(f"Cleared {removed} cached workbook parse(s) from {args.cache_dir}")
+
+    if args.columnar and not args.hashed:
+        parser.error("--columnar requires --hashed (pages only load columnar data via the manifest)")
+
+    if args.watch and not args.export_json:
+        parser.error("--watch requires --export-json")
+
+    if args.nearest < 0:
+        parser.error("--nearest cannot be negative")
+    export_options = {"hashed": args.hashed, "columnar": args.columnar,
+                      "nearest_k": args.nearest, "same_category": not args.nearest_any_category,
+                      "sharded": args.sharded}
+
+    if args.watch:
+        watch_export(args.xlsx, args.export_json, cache_dir, args.slug_rules, **export_options)
+        return
+
     if args.export_json:
-        try:
-            import openpyxl  # noqa: F401
-        except ImportError:
-            print("ERROR: openpyxl not installed. Run: pip3 install openpyxl")
-            sys.exit(1)
-        export_json(args.xlsx, args.export_json)
+        export_json(args.xlsx, args.export_json, cache_dir, **export_options)
+        return
+
+    # ---- Offline SQLite seeding mode ----
+    if args.seed_sqlite:
+        print(f"\nSeeding {args.seed_sqlite} from {source_label(args.xlsx)}...")
+        with PROFILE.phase("source load"):
+            tools, alternatives = load_workbook_data(args.xlsx, cache_dir)
+        with PROFILE.phase("sqlite seed"):
+            seed_sqlite(args.seed_sqlite, tools, alternatives)
+        print("\nDone! Start PocketBase to serve the seeded data.")
         return
 
-    # ---- PocketBase import mode — requires credentials ----
+    # ---- PocketBase modes — require credentials ----
     if not args.url or not args.email or not args.password:
         parser.error("--url, --email, and --password are required for PocketBase import (or use --export-json)")
 
-    pb = PocketBaseClient(args.url)
+    if args.timeout <= 0:
+        parser.error("--timeout must be positive")
+    if args.retries < 0:
+        parser.error("--retries cannot be negative")
+
+    if args.export_analytics:
+        pb = PocketBaseClient(args.url, timeout=args.timeout, retries=args.retries)
+        print("\n[1/2] Authenticating...")
+        with PROFILE.phase("auth"):
+            pb.authenticate(args.email, args.password)
+        print("\n[2/2] Aggregating assessments...")
+        with PROFILE.phase("analytics"):
+            export_analytics(pb, args.export_analytics)
+        return
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.batch_size < 0:
+        parser.error("--batch-size cannot be negative")
+    if args.prune and not args.sync:
+        parser.error("--prune requires --sync")
+    if args.resume and args.sync:
+        parser.error("--resume is for create-only imports; --sync already skips existing records")
+    if args.plan_json and not args.plan:
+        parser.error("--plan-json requires --plan")
+    if args.plan and args.skip_import:
+        parser.error("--plan compares the workbook with the live data; drop --skip-import")
+
+    # ---- Read the workbook first, so invalid rows stop the run before any write ----
+    if not args.skip_import:
+        print(f"\n[1/5] Reading {source_label(args.xlsx)}...")
+        with PROFILE.phase("source load"):
+            tools, alternatives = load_workbook_data(args.xlsx, cache_dir)
+        print(f"  Found {len(tools)} tools and {len(alternatives)} alternatives")
+    else:
+        print("\n[1/5] Skipping source data")
+
+    pb = PocketBaseClient(args.url, pool_size=max(args.workers, 10),
+                          timeout=args.timeout, retries=args.retries)
 
     # ---- Authenticate ----
-    print("\n[1/5] Authenticating...")
-    pb.authenticate(args.email, args.password)
+    print("\n[2/5] Authenticating...")
+    with PROFILE.phase("auth"):
+        pb.authenticate(args.email, args.password)
+
+    # ---- Dry run: compare only ----
+    if args.plan:
+        print("\n[3/5] Comparing with the live data...")
+        with PROFILE.phase("plan"):
+            plan = plan_import(pb, tools, alternatives, args)
+        print_plan(plan)
+        if args.plan_json:
+            write_json(args.plan_json, plan)
+        return
 
     # ---- Create Collections ----
     if not args.skip_collections:
-        print("\n[2/5] Creating collections...")
+        print("\n[3/5] Creating collections...")
         collection_ids = {}
 
-        for coll_def in COLLECTIONS:
-            name = coll_def["name"]
-            existing = pb.get_collection(name)
-            if existing:
-                print(f"  '{name}' already exists, skipping")
-                collection_ids[name] = existing["id"]
-                continue
-
-            # Build the schema, replacing __tools__ placeholder with actual ID
-            schema = []
-            for field in coll_def["schema"]:
-                field_copy = dict(field)
-                if field_copy.get("options", {}).get("collectionId") == "__tools__":
-                    if "tools" not in collection_ids:
-                        print(f"  ERROR: 'tools' collection must be created before '{name}'")
-                        sys.exit(1)
-                    field_copy["options"] = dict(field_copy["options"])
-                    field_copy["options"]["collectionId"] = collection_ids["tools"]
-                schema.append(field_copy)
-
-            payload = {
-                "name": name,
-                "type": coll_def["type"],
-                "schema": schema,
-                "listRule": coll_def.get("listRule"),
-                "viewRule": coll_def.get("viewRule"),
-                "createRule": coll_def.get("createRule"),
-                "updateRule": coll_def.get("updateRule"),
-                "deleteRule": coll_def.get("deleteRule"),
-            }
-
-            result = pb.create_collection(payload)
-            if result:
-                collection_ids[name] = result["id"]
-                print(f"  Created '{name}' (id: {result['id']})")
-            else:
-                sys.exit(1)
+        with PROFILE.phase("collections"):
+            live = pb.list_collections()
+            missing = []
+            for coll_def in COLLECTIONS:
+                name = coll_def["name"]
+                if name in live:
+                    print(f"  '{name}' already exists, skipping")
+                    collection_ids[name] = live[name]["id"]
+                    continue
+                # Ids are chosen here so the __tools__ relation can name a collection in the same request
+                collection_ids[name] = pb_id()
+                missing.append({"id": collection_ids[name],
+                                **collection_payload(coll_def, collection_ids, pb.fields_layout)})
+
+            if missing:
+                try:
+                    pb.import_collections(missing)
+                except (PocketBaseError, requests.RequestException) as e:
+                    print(f"  Failed to create collections {', '.join(c['name'] for c in missing)}: {e}")
+                    sys.exit(1)
+            for payload in missing:
+                print(f"  Created '{payload['name']}' (id: {payload['id']})")
     else:
-        print("\n[2/5] Skipping collection creation")
+        print("\n[3/5] Skipping collection creation")
 
     # ---- Import Data ----
+    failures = []
+    stale = []
+    journal = None
     if not args.skip_import:
-        print("\n[3/5] Reading xlsx data...")
-        try:
-            import openpyxl
-        except ImportError:
-            print("  ERROR: openpyxl not installed. Run: pip3 install openpyxl")
-            sys.exit(1)
-
-        wb = openpyxl.load_workbook(args.xlsx, data_only=True)
-        sheets = wb.sheetnames
+        if not args.sync:
+            journal = ImportJournal(args.journal, args.url, resume=args.resume)
 
         # -- Tools --
         print("\n[4/5] Importing tools...")
-        ws_tools = wb[sheets[0]]
-        tool_slug_to_id = {}
-
-        for row in ws_tools.iter_rows(min_row=2):
-            vals = [c.value for c in row]
-            if vals[0] is None:
-                break
+        tool_rows = [to_record(t) for t in tools]
 
-            name = str(vals[0])
-            slug = slugify(name)
-
-            data = {
-                "name": name,
-                "slug": slug,
-                "category": str(vals[1] or ""),
-                "provider": str(vals[2] or ""),
-                "hqCountry": str(vals[3] or ""),
-                "dataHosting": str(vals[4] or ""),
-                "jurisdiction": safe_int(vals[5]),
-                "continuity": safe_int(vals[6]),
-                "surveillance": safe_int(vals[7]),
-                "lockIn": safe_int(vals[8]),
-                "costExposure": safe_int(vals[9]),
-                "total": safe_int(vals[10]),
-                "riskLevel": str(vals[11] or ""),
-                "keyRisks": str(vals[12] or ""),
-                "lastReviewed": str(vals[13] or ""),
-            }
-
-            record = pb.create_record("tools", data)
-            if record:
-                tool_slug_to_id[slug] = record["id"]
-                print(f"  + {name} ({slug})")
+        # Archetypes need tool IDs, so tools must finish before archetypes start
+        changes = write_records(pb, "tools", tool_rows, args, failures, stale, journal)
+        tool_slug_to_id = {}
+        for op, data, record in changes:
+            tool_slug_to_id[data["slug"]] = record["id"]
+            if op != "=":
+                print(f"  {op} {data['name']} ({data['slug']})")
 
         print(f"  Imported {len(tool_slug_to_id)} tools")
 
         # -- Alternatives --
         print("\n  Importing alternatives...")
-        ws_alts = wb[sheets[1]]
-        alt_count = 0
+        alt_rows = [to_record(a) for a in alternatives]
 
-        for row in ws_alts.iter_rows(min_row=2):
-            vals = [c.value for c in row]
-            if vals[0] is None:
-                break
+        changes = write_records(pb, "alternatives", alt_rows, args, failures, stale, journal)
+        for op, data, _ in changes:
+            if op != "=":
+                print(f"  {op} {data['name']}")
 
-            name = str(vals[0])
-            slug = slugify(name)
-
-            # Slugify alternativeTo as comma-separated slugs for consistent references
-            alt_to_raw = str(vals[2] or "")
-            alt_to_slugs = ",".join(slugify(part.strip()) for part in alt_to_raw.split(",") if part.strip())
-
-            data = {
-                "name": name,
-                "slug": slug,
-                "category": str(vals[1] or ""),
-                "alternativeTo": alt_to_slugs,
-                "provider": str(vals[3] or ""),
-                "hqCountry": str(vals[4] or ""),
-                "openSource": parse_bool_select(vals[5]),
-                "selfHostable": parse_bool_select(vals[6]),
-                "dataHosting": str(vals[7] or ""),
-                "jurisdiction": safe_int(vals[8]),
-                "continuity": safe_int(vals[9]),
-                "surveillance": safe_int(vals[10]),
-                "lockIn": safe_int(vals[11]),
-                "costExposure": safe_int(vals[12]),
-                "total": safe_int(vals[13]),
-                "approxCost": str(vals[14] or ""),
-                "migrationDifficulty": str(vals[15] or ""),
-                "tradeoffs": str(vals[16] or ""),
-                "lastReviewed": str(vals[17] or ""),
-            }
-
-            record = pb.create_record("alternatives", data)
-            if record:
-                alt_count += 1
-                print(f"  + {name}")
-
-        print(f"  Imported {alt_count} alternatives")
+        print(f"  Imported {len(changes)} alternatives")
 
         # -- Archetypes --
         print("\n  Importing archetypes...")
-        for arch in ARCHETYPES:
-            tool_ids = []
-            for ts in arch["tool_slugs"]:
-                if ts in tool_slug_to_id:
-                    tool_ids.append(tool_slug_to_id[ts])
-                else:
-                    print(f"  WARNING: Tool slug '{ts}' not found for archetype '{arch['name']}'")
-
-            data = {
-                "name": arch["name"],
-                "slug": arch["slug"],
-                "description": arch["description"],
-                "tools": tool_ids,
-            }
-            record = pb.create_record("archetypes", data)
-            if record:
-                print(f"  + {arch['name']} ({len(tool_ids)} tools)")
+        if any(f["collection"] == "tools" for f in failures):
+            # Their tools relation would silently miss the failed tools
+            print("  Skipping archetypes until every tool is imported")
+        else:
+            arch_rows = archetype_records(tool_slug_to_id)
+
+            changes = write_records(pb, "archetypes", arch_rows, args, failures, stale, journal)
+            for op, data, _ in changes:
+                if op != "=":
+                    print(f"  {op} {data['name']} ({len(data['tools'])} tools)")
 
         # -- Scoring Guide --
         print("\n  Importing scoring guide...")
-        for entry in SCORING_GUIDE:
-            pb.create_record("scoring_guide", entry)
-        print(f"  Imported {len(SCORING_GUIDE)} scoring guide entries")
+        changes = write_records(pb, "scoring_guide", SCORING_GUIDE, args, failures, stale, journal)
+        print(f"  Imported {len(changes)} scoring guide entries")
+
+        # -- Prune --
+        # Archetypes reference tools, so stale records go in reverse import order
+        if args.prune:
+            print("\n  Pruning stale records...")
+            for collection, records in reversed(stale):
+                with PROFILE.phase(f"prune {collection}"):
+                    failures.extend(prune_records(pb, collection, records, args.workers))
 
     else:
-        print("\n[3-4/5] Skipping data import")
+        print("\n[4/5] Skipping data import")
 
     # ---- Summary ----
     print("\n[5/5] Done!")
@@ -693,6 +3257,15 @@ def main():
     print(f"  API: {args.url}/api/collections/archetypes/records?expand=tools")
     print()
 
+    if journal:
+        # A clean run needs no resume point; keep the journal otherwise
+        journal.close(remove=not failures)
+    if failures:
+        print_failures(failures)
+        if journal:
+            print(f"\n  Fix the cause and re-run with --resume to continue from {args.journal}")
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
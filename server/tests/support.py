@@ -0,0 +1,86 @@
+"""Shared helpers for the import-data.py tests."""
+
+import csv
+import importlib.util
+import os
+
+
+def load_importer():
+    """Load import-data.py, whose hyphenated name rules out a plain import."""
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "import-data.py")
+    spec = importlib.util.spec_from_file_location("import_data", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+importer = load_importer()
+
+TOOL_HEADER = [
+    "Tool", "Category", "Provider", "HQ Country", "Data Hosting",
+    "Jurisdiction", "Continuity", "Surveillance", "Lock-in", "Cost Exposure",
+    "Total", "Risk Level", "Key Risks", "Last Reviewed",
+]
+
+ALTERNATIVE_HEADER = [
+    "Alternative", "Category", "Alternative To", "Provider", "HQ Country",
+    "Open Source", "Self-hostable", "Data Hosting",
+    "Jurisdiction", "Continuity", "Surveillance", "Lock-in", "Cost Exposure",
+    "Total", "Approx Cost", "Migration Difficulty", "Trade-offs", "Last Reviewed",
+]
+
+CATEGORIES = ["Email & Calendar", "Document Storage", "Video Calls"]
+
+
+def archetype_tool_names():
+    """A name for every tool slug the archetypes reference, so their relations resolve."""
+    slugs = dict.fromkeys(slug for arch in importer.ARCHETYPES for slug in arch["tool_slugs"])
+    return {slug: slug.replace("-", " ").title() for slug in slugs}
+
+
+def tool_rows(names):
+    """Tools sheet rows (header first) with varied valid scores."""
+    rows = [list(TOOL_HEADER)]
+    for i, name in enumerate(names):
+        scores = [1 + (i + d) % 5 for d in range(5)]
+        rows.append([name, CATEGORIES[i % len(CATEGORIES)], f"Provider {i}", "USA", "US",
+                     *scores, sum(scores), "High", "Lock-in.", "2026-01"])
+    return rows
+
+
+def alternative_rows(targets):
+    """Alternatives sheet rows (header first), one per target tool name."""
+    rows = [list(ALTERNATIVE_HEADER)]
+    for i, target in enumerate(targets):
+        scores = [1 + (i + d) % 3 for d in range(5)]
+        rows.append([f"Alt {i}", CATEGORIES[i % len(CATEGORIES)], target, f"Host {i}", "Germany",
+                     "Yes", "No", "EU", *scores, sum(scores), "£5", "Low", "Fewer integrations.", "2026-01"])
+    return rows
+
+
+def write_csv_source(directory, tools, alternatives):
+    """Write tools.csv and alternatives.csv, a source import-data.py reads without openpyxl."""
+    for name, rows in (("tools", tools), ("alternatives", alternatives)):
+        with open(os.path.join(directory, f"{name}.csv"), "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+    return directory
+
+
+def decode_columnar(data):
+    """Python mirror of decodeColumnar() in assess/index.html."""
+    if not isinstance(data, dict) or data.get("format") != "columnar-v1":
+        return data
+    packed = data.get("packed") or {"fields": [], "data": []}
+    width = len(packed["fields"])
+    rows = []
+    for i in range(data["length"]):
+        row = {}
+        for f in data["fields"]:
+            if f in packed["fields"]:
+                row[f] = int(packed["data"][i * width + packed["fields"].index(f)])
+            elif f in data["dicts"]:
+                row[f] = data["dicts"][f][data["columns"][f][i]]
+            else:
+                row[f] = data["columns"][f][i]
+        rows.append(row)
+    return rows
@@ -0,0 +1,63 @@
+"""columnar-v1 encoding: what the pages decode must be the rows that were exported."""
+
+import json
+import tempfile
+import unittest
+
+from support import alternative_rows, decode_columnar, importer, tool_rows, write_csv_source
+
+NAMES = ["Alpha Mail", "Beta Drive", "Gamma Meet", "Delta Chat"]
+
+
+class ColumnarTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        write_csv_source(tmp.name, tool_rows(NAMES), alternative_rows(NAMES))
+        self.tools, self.alternatives = importer.read_workbook(tmp.name)
+
+    def round_trip(self, rows):
+        # Through JSON, as the pages receive it
+        return decode_columnar(json.loads(json.dumps(importer.to_columnar(rows))))
+
+    def test_tools_round_trip(self):
+        decoded = self.round_trip(self.tools)
+        self.assertEqual(decoded, self.tools)
+        self.assertEqual([list(row) for row in decoded], [list(row) for row in self.tools])
+
+    def test_alternatives_round_trip(self):
+        self.assertEqual(self.round_trip(self.alternatives), self.alternatives)
+
+    def test_single_digit_scores_pack_into_a_string(self):
+        encoded = importer.to_columnar(self.tools)
+        self.assertEqual(encoded["packed"]["fields"], importer.DIMENSIONS)
+        self.assertIsInstance(encoded["packed"]["data"], str)
+        self.assertEqual(len(encoded["packed"]["data"]), len(self.tools) * len(importer.DIMENSIONS))
+        for field in importer.DIMENSIONS:
+            self.assertNotIn(field, encoded["columns"])
+
+    def test_wide_scores_pack_into_a_number_array(self):
+        rows = [dict(row) for row in self.tools]
+        rows[1]["surveillance"] = 12
+        encoded = importer.to_columnar(rows)
+        self.assertIsInstance(encoded["packed"]["data"], list)
+        self.assertEqual(self.round_trip(rows), rows)
+
+    def test_dict_fields_store_indices(self):
+        encoded = importer.to_columnar(self.tools)
+        categories = encoded["dicts"]["category"]
+        self.assertEqual(len(categories), len(set(categories)))
+        self.assertEqual([categories[i] for i in encoded["columns"]["category"]],
+                         [t["category"] for t in self.tools])
+
+    def test_rows_without_scores_are_not_packed(self):
+        rows = [{"slug": t["slug"], "category": t["category"]} for t in self.tools]
+        self.assertNotIn("packed", importer.to_columnar(rows))
+        self.assertEqual(self.round_trip(rows), rows)
+
+    def test_empty_rows(self):
+        self.assertEqual(self.round_trip([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,162 @@
+"""Checkpoint journal: a resumed import writes only what is left and counts every row once."""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from support import importer
+
+TARGET = "http://127.0.0.1:8090"
+
+
+class FakePocketBase:
+    """Records creates in memory; batches fail whole if they hold a slug in `fail`."""
+
+    def __init__(self, batch=True, fail=()):
+        self.batch = batch
+        self.batch_supported = None  # Unknown until the first batch, as in PocketBaseClient
+        self.fail = set(fail)
+        self.records = {}
+        self.requests = 0
+
+    def create(self, collection, data):
+        if data.get("slug") in self.fail:
+            raise importer.PocketBaseError(400, "rejected")
+        record = dict(data, id=f"r{len(self.records) + 1:05d}")
+        self.records[record["id"]] = (collection, record)
+        return record
+
+    def create_record(self, collection, data):
+        self.requests += 1
+        return self.create(collection, data)
+
+    def batch_create(self, collection, rows):
+        self.requests += 1
+        self.batch_supported = self.batch
+        if not self.batch:
+            raise importer.BatchNotSupported(404, "not found")
+        if any(row.get("slug") in self.fail for row in rows):
+            raise importer.PocketBaseError(400, "batch rolled back")
+        return [self.create(collection, row) for row in rows]
+
+
+def rows(count):
+    return [{"slug": f"tool-{i}", "name": f"Tool {i}"} for i in range(count)]
+
+
+class JournalTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = os.path.join(tmp.name, "import.journal")
+        self.quiet = contextlib.redirect_stdout(io.StringIO())
+        self.quiet.__enter__()
+        self.addCleanup(self.quiet.__exit__, None, None, None)
+
+    def journal(self, resume=False):
+        journal = importer.ImportJournal(self.path, TARGET, resume=resume)
+        self.addCleanup(journal.file.close)
+        return journal
+
+    def write(self, pb, data, journal, batch_size=0, workers=1):
+        args = argparse.Namespace(sync=False, workers=workers, batch_size=batch_size)
+        failures = []
+        changes = importer.write_records(pb, "tools", data, args, failures, [], journal)
+        return changes, failures
+
+    def test_resume_skips_journalled_rows(self):
+        data = rows(10)
+        first = self.journal()
+        pb = FakePocketBase()
+        self.write(pb, data[:4], first)
+        first.close()
+
+        resumed = self.journal(resume=True)
+        self.assertEqual(len(resumed.completed("tools")), 4)
+        changes, failures = self.write(pb, data, resumed)
+        self.assertEqual(failures, [])
+        self.assertEqual(len(changes), len(data))
+        self.assertEqual([op for op, _, _ in changes].count("="), 4)
+        self.assertEqual([op for op, _, _ in changes].count("+"), 6)
+        self.assertEqual(len(pb.records), len(data))
+        # Unchanged rows come back with the id they were created under
+        ids = {record["slug"]: rid for rid, (_, record) in pb.records.items()}
+        for op, row, record in changes:
+            self.assertEqual(record["id"], ids[row["slug"]])
+
+    def test_resume_counts_batched_rows_once(self):
+        data = rows(25)
+        pb = FakePocketBase()
+        first = self.journal()
+        self.write(pb, data[:10], first, batch_size=5)
+        first.close()
+
+        changes, _ = self.write(pb, data, self.journal(resume=True), batch_size=5)
+        self.assertEqual(len(changes), len(data))
+        self.assertEqual(sorted(row["slug"] for _, row, _ in changes), sorted(r["slug"] for r in data))
+        self.assertEqual(pb.requests, 2 + 3)
+
+    def test_fully_journalled_import_writes_nothing(self):
+        data = rows(6)
+        pb = FakePocketBase()
+        first = self.journal()
+        self.write(pb, data, first, workers=4)
+        first.close()
+
+        changes, _ = self.write(pb, data, self.journal(resume=True), workers=4)
+        self.assertEqual([op for op, _, _ in changes], ["="] * len(data))
+        self.assertEqual(pb.requests, len(data))
+
+    def test_completed_is_a_copy(self):
+        journal = self.journal()
+        journal.record("tools", "tool-0", "r00001")
+        done = journal.completed("tools")
+        journal.record("tools", "tool-1", "r00002")
+        self.assertEqual(done, {"tool-0": "r00001"})
+        self.assertEqual(len(journal.completed("tools")), 2)
+
+    def test_failed_batch_is_not_journalled(self):
+        data = rows(6)
+        pb = FakePocketBase(fail={"tool-4"})
+        journal = self.journal()
+        changes, failures = self.write(pb, data, journal, batch_size=3)
+        self.assertEqual(len(changes), 3)
+        self.assertEqual(sorted(f["key"] for f in failures), ["tool-3", "tool-4", "tool-5"])
+        self.assertEqual(sorted(journal.completed("tools")), ["tool-0", "tool-1", "tool-2"])
+
+    def test_no_batch_support_falls_back_to_single_creates(self):
+        data = rows(4)
+        pb = FakePocketBase(batch=False)
+        changes, _ = self.write(pb, data, self.journal(), batch_size=10)
+        self.assertEqual(len(changes), 4)
+        self.assertEqual(pb.requests, 1 + 4)
+        # Once the server has said no, later imports skip the batch attempt
+        changes, _ = self.write(pb, rows(6)[4:], self.journal(), batch_size=10)
+        self.assertEqual(len(changes), 2)
+        self.assertEqual(pb.requests, 5 + 2)
+
+    def test_torn_last_line_is_ignored(self):
+        journal = self.journal()
+        journal.record("tools", "tool-0", "r00001")
+        journal.close()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write('{"c": "tools", "k": "tool-1"')
+        self.assertEqual(self.journal(resume=True).completed("tools"), {"tool-0": "r00001"})
+
+    def test_resume_refuses_another_target(self):
+        self.journal().close()
+        with self.assertRaises(SystemExit):
+            importer.ImportJournal(self.path, "http://elsewhere:8090", resume=True)
+
+    def test_new_journal_names_its_target(self):
+        self.journal().close()
+        with open(self.path, encoding="utf-8") as f:
+            self.assertEqual(json.loads(f.readline()), {"target": TARGET})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Trigram search index: the typeahead's candidates must include every tool its exact test would match."""
+
+import json
+import re
+import unittest
+
+from support import importer
+
+TOOLS = [
+    {"slug": "google-workspace", "name": "Google Workspace (Gmail, Drive, Docs)",
+     "provider": "Google LLC (Alphabet)", "category": "Productivity Suite"},
+    {"slug": "microsoft-365", "name": "Microsoft 365 (Outlook, OneDrive)",
+     "provider": "Microsoft Corp", "category": "Productivity Suite"},
+    {"slug": "monday-com", "name": "Monday.com", "provider": "Monday.com Ltd", "category": "Project Management"},
+    {"slug": "x-twitter", "name": "X / Twitter", "provider": "X Corp", "category": "Social Media"},
+    {"slug": "surveymonkey", "name": "SurveyMonkey", "provider": "Momentive Global", "category": "Forms / Surveys"},
+]
+
+
+def slugify(query):
+    """The page's slugify(): lowercase, runs of other characters to "-"."""
+    return re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")
+
+
+def search_candidates(index, tools, query):
+    """Python mirror of searchCandidates() in assess/index.html."""
+    q = slugify(query)
+    if len(q) < 2:
+        return tools
+    by_slug = {t["slug"]: t for t in tools}
+    grams = index["grams"]
+    if len(q) == 2:
+        docs = {d for g, ds in grams.items() if g[:2] == q or g[1:] == q for d in ds}
+    else:
+        docs = None
+        for i in range(len(q) - 2):
+            found = grams.get(q[i:i + 3])
+            if found is None:
+                return []
+            docs = set(found) if docs is None else docs & set(found)
+    return [by_slug[index["docs"][d]] for d in sorted(docs)]
+
+
+def exact_match(tool, query):
+    """The test the page applies to each candidate."""
+    return any(query in tool[field].lower() for field in ("name", "category", "provider"))
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        # Through JSON, as the page receives it
+        self.index = json.loads(json.dumps(importer.build_search_index(TOOLS)))
+
+    def test_docs_are_tool_slugs_in_export_order(self):
+        self.assertEqual(self.index["version"], 2)
+        self.assertEqual(self.index["docs"], [t["slug"] for t in TOOLS])
+
+    def test_grams_are_trigrams_with_ascending_doc_lists(self):
+        for gram, docs in self.index["grams"].items():
+            self.assertEqual(len(gram), 3)
+            self.assertEqual(docs, sorted(set(docs)))
+            self.assertTrue(all(0 <= d < len(TOOLS) for d in docs))
+
+    def test_candidates_cover_every_exact_match(self):
+        for tool in TOOLS:
+            for field in ("name", "provider", "category"):
+                text = tool[field].lower()
+                for size in range(2, 8):
+                    for start in range(len(text) - size + 1):
+                        query = text[start:start + size]
+                        expected = [t["slug"] for t in TOOLS if exact_match(t, query)]
+                        found = {t["slug"] for t in search_candidates(self.index, TOOLS, query)}
+                        self.assertLessEqual(set(expected), found, query)
+
+    def test_parenthetical_names_are_searchable(self):
+        found = search_candidates(self.index, TOOLS, "gmail")
+        self.assertEqual([t["slug"] for t in found], ["google-workspace"])
+
+    def test_query_narrows_candidates(self):
+        found = search_candidates(self.index, TOOLS, "microsoft")
+        self.assertEqual([t["slug"] for t in found], ["microsoft-365"])
+
+    def test_unknown_trigram_finds_nothing(self):
+        self.assertEqual(search_candidates(self.index, TOOLS, "zzz"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
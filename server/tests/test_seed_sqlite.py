@@ -0,0 +1,100 @@
+"""--seed-sqlite against scratch databases in both PocketBase storage layouts."""
+
+import contextlib
+import io
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from support import alternative_rows, archetype_tool_names, importer, tool_rows, write_csv_source
+
+
+class SeedSqliteTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+        names = archetype_tool_names()
+        write_csv_source(self.dir, tool_rows(names.values()), alternative_rows(list(names.values())[:4]))
+        self.tools, self.alternatives = importer.read_workbook(self.dir)
+
+    def scratch_db(self, fields_column):
+        path = os.path.join(self.dir, f"{fields_column}.db")
+        db = sqlite3.connect(path)
+        db.execute(importer.PB_COLLECTIONS_DDL.format(fields_column=fields_column))
+        db.commit()
+        db.close()
+        return path
+
+    def seed(self, path):
+        with contextlib.redirect_stdout(io.StringIO()):
+            importer.seed_sqlite(path, self.tools, self.alternatives)
+
+    def count(self, db, table):
+        return db.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+
+    def check_seeded(self, path, fields_column):
+        db = sqlite3.connect(path)
+        self.addCleanup(db.close)
+        self.assertEqual(self.count(db, "tools"), len(self.tools))
+        self.assertEqual(self.count(db, "alternatives"), len(self.alternatives))
+        self.assertEqual(self.count(db, "archetypes"), len(importer.ARCHETYPES))
+        self.assertEqual(self.count(db, "scoring_guide"), len(importer.SCORING_GUIDE))
+
+        slug_by_id = dict(db.execute("SELECT id, slug FROM tools"))
+        for arch in importer.ARCHETYPES:
+            (tool_ids,) = db.execute("SELECT tools FROM archetypes WHERE slug = ?", (arch["slug"],)).fetchone()
+            self.assertEqual([slug_by_id[i] for i in json.loads(tool_ids)], arch["tool_slugs"])
+
+        # The relation field points at the seeded tools collection
+        collection_ids = dict(db.execute("SELECT name, id FROM _collections"))
+        (fields,) = db.execute(f"SELECT {fields_column} FROM _collections WHERE name = 'archetypes'").fetchone()
+        relation = next(f for f in json.loads(fields) if f["name"] == "tools")
+        options = relation if fields_column == "fields" else relation["options"]
+        self.assertEqual(options["collectionId"], collection_ids["tools"])
+
+    def test_seeds_0_23_layout(self):
+        path = self.scratch_db("fields")
+        self.seed(path)
+        self.check_seeded(path, "fields")
+        db = sqlite3.connect(path)
+        self.addCleanup(db.close)
+        (fields,) = db.execute("SELECT fields FROM _collections WHERE name = 'tools'").fetchone()
+        names = [f["name"] for f in json.loads(fields)]
+        self.assertEqual(names[0], "id")
+        self.assertIn("created", names)
+
+    def test_seeds_0_22_layout(self):
+        path = self.scratch_db("schema")
+        self.seed(path)
+        self.check_seeded(path, "schema")
+
+    def test_missing_collections_table_gets_0_23_layout(self):
+        path = os.path.join(self.dir, "empty.db")
+        self.seed(path)
+        self.check_seeded(path, "fields")
+
+    def test_refuses_to_seed_twice(self):
+        path = self.scratch_db("fields")
+        self.seed(path)
+        with self.assertRaises(SystemExit):
+            self.seed(path)
+        self.check_seeded(path, "fields")
+
+    def test_refuses_unknown_layout(self):
+        path = os.path.join(self.dir, "other.db")
+        db = sqlite3.connect(path)
+        db.execute("CREATE TABLE _collections (id TEXT PRIMARY KEY, name TEXT)")
+        db.commit()
+        db.close()
+        with self.assertRaises(SystemExit):
+            self.seed(path)
+        db = sqlite3.connect(path)
+        self.addCleanup(db.close)
+        self.assertIsNone(db.execute("SELECT 1 FROM sqlite_master WHERE name = 'tools'").fetchone())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+"""Sharded layout: every row lands in exactly one shard, and the catalogue points at it."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from support import decode_columnar, importer
+
+# Categories of a few families, some with several labels
+CATEGORIES = {
+    "Email": 4, "Email & Calendar": 3, "Forms": 2, "Forms / Surveys": 5,
+    "Cloud Storage": 6, "Cloud Infrastructure": 2, "CRM": 7, "Design": 1,
+}
+
+
+def rows():
+    """Tool rows spread over CATEGORIES, with every catalogue and shard field."""
+    out = []
+    for category, count in CATEGORIES.items():
+        for i in range(count):
+            slug = f"{importer.slugify(category)}-{i}"
+            out.append({"id": len(out) + 1, "slug": slug, "name": slug.title(), "category": category,
+                        "provider": "Provider", **dict.fromkeys(importer.DIMENSIONS, 3),
+                        "total": 15, "riskLevel": "High"})
+    return out
+
+
+class ShardTest(unittest.TestCase):
+    def setUp(self):
+        self.rows = rows()
+
+    def shard_rows(self, shards):
+        return {name: decode_columnar(json.loads(json.dumps(shard))) for name, shard in shards.items()}
+
+    def test_every_row_in_exactly_one_shard(self):
+        for min_rows in (1, 5, 12, 1000):
+            shards, files = importer.build_shards("tools", self.rows, min_rows)
+            decoded = self.shard_rows(shards)
+            slugs = [row["slug"] for shard in decoded.values() for row in shard]
+            self.assertEqual(sorted(slugs), sorted(r["slug"] for r in self.rows))
+            # The category map sends each row to the shard that holds it
+            for name, shard in decoded.items():
+                for row in shard:
+                    self.assertEqual(files[row["category"]], name)
+            self.assertEqual(set(files.values()), set(shards))
+
+    def test_families_stay_together(self):
+        _, files = importer.build_shards("tools", self.rows, min_rows=1)
+        self.assertEqual(files["Forms"], files["Forms / Surveys"])
+        self.assertEqual(files["Email"], files["Email & Calendar"])
+        self.assertNotEqual(files["Cloud Storage"], files["Cloud Infrastructure"])
+
+    def test_shards_hold_at_least_min_rows(self):
+        shards, _ = importer.build_shards("tools", self.rows, min_rows=8)
+        sizes = [shard["length"] for shard in shards.values()]
+        self.assertGreater(len(sizes), 1)
+        # Only the last shard, holding what is left, may fall short
+        self.assertTrue(all(size >= 8 for size in sizes[:-1]))
+
+    def test_small_catalogue_is_one_shard(self):
+        shards, files = importer.build_shards("tools", self.rows)
+        self.assertEqual(len(shards), 1)
+        self.assertEqual(set(files), set(CATEGORIES))
+
+    def test_shard_names_match_the_stale_file_pattern(self):
+        shards, _ = importer.build_shards("alternatives", self.rows, min_rows=1)
+        for name in shards:
+            self.assertTrue(name.startswith("shard-alternatives-"))
+            self.assertTrue(importer.SHARD_FILE_RE.match(name))
+
+    def test_catalogue_lists_every_row_and_shard(self):
+        alternatives = [dict(row, slug=f"alt-{row['slug']}") for row in self.rows[:10]]
+        catalogue, shards = importer.build_catalogue(self.rows, alternatives, [])
+        tools = decode_columnar(catalogue["tools"])
+        self.assertEqual([list(t) for t in tools[:1]], [importer.CATALOGUE_TOOL_FIELDS])
+        self.assertEqual([t["slug"] for t in tools], [r["slug"] for r in self.rows])
+        self.assertEqual(len(decode_columnar(catalogue["alternatives"])), len(alternatives))
+        for kind, source in (("tools", self.rows), ("alternatives", alternatives)):
+            files = catalogue["shards"][kind]
+            self.assertEqual(set(files), {r["category"] for r in source})
+            self.assertLessEqual(set(files.values()), set(shards))
+
+    def test_stale_shards_are_removed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            keep = "shard-tools-crm.json"
+            names = [keep, "shard-tools-old.json", "shard-tools-old.0123456789.json.gz", "catalogue.json"]
+            for name in names:
+                open(os.path.join(directory, name), "w").close()
+            importer.remove_stale_shards(directory, {keep: {}})
+            self.assertEqual(sorted(os.listdir(directory)), ["catalogue.json", keep])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+"""Workbook validation: every bad cell is reported, with the sheet, cell and reason."""
+
+import tempfile
+import unittest
+
+from support import TOOL_HEADER, alternative_rows, importer, tool_rows, write_csv_source
+
+NAMES = ["Alpha Mail", "Beta Drive", "Gamma Meet"]
+
+
+class ValidationTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def read(self, tools, alternatives=None):
+        write_csv_source(self.dir, tools, alternatives or alternative_rows(NAMES[:1]))
+        return importer.read_workbook(self.dir)
+
+    def errors(self, tools, alternatives=None):
+        with self.assertRaises(importer.WorkbookInvalid) as caught:
+            self.read(tools, alternatives)
+        return caught.exception.errors
+
+    def tools_with(self, row, column, value):
+        rows = tool_rows(NAMES)
+        rows[row][TOOL_HEADER.index(column)] = value
+        return rows
+
+    def test_valid_sheets_read(self):
+        tools, alternatives = self.read(tool_rows(NAMES))
+        self.assertEqual([t["name"] for t in tools], NAMES)
+        self.assertEqual(len(alternatives), 1)
+        self.assertEqual(tools[0]["total"], sum(tools[0][d] for d in importer.DIMENSIONS))
+
+    def test_reordered_columns_read_the_same(self):
+        rows = tool_rows(NAMES)
+        reordered = [list(reversed(row)) for row in rows]
+        self.assertEqual(self.read(reordered), self.read(rows))
+
+    def test_blank_score_is_required(self):
+        (error,) = self.errors(self.tools_with(2, "Surveillance", ""))
+        self.assertEqual(error["field"], "surveillance")
+        self.assertEqual(error["cell"], "H3")
+        self.assertEqual(error["message"], "is required")
+
+    def test_every_blank_score_is_reported(self):
+        rows = tool_rows(NAMES)
+        for row in rows[1:]:
+            for column in ("Jurisdiction", "Continuity", "Surveillance", "Lock-in", "Cost Exposure", "Total"):
+                row[TOOL_HEADER.index(column)] = ""
+        errors = self.errors(rows)
+        self.assertEqual(len(errors), len(NAMES) * 6)
+        self.assertTrue(all(e["message"] == "is required" for e in errors))
+
+    def test_blank_alternative_score_is_required(self):
+        alternatives = alternative_rows(NAMES[:2])
+        alternatives[1][alternatives[0].index("Lock-in")] = None
+        (error,) = self.errors(tool_rows(NAMES), alternatives)
+        self.assertEqual((error["field"], error["message"]), ("lockIn", "is required"))
+
+    def test_unknown_header_is_reported(self):
+        rows = tool_rows(NAMES)
+        rows[0][TOOL_HEADER.index("Total")] = "Total Score"
+        errors = self.errors(rows)
+        unmatched = [e for e in errors if e["field"] == "(header)"]
+        self.assertEqual(len(unmatched), 1)
+        self.assertEqual((unmatched[0]["cell"], unmatched[0]["value"]), ("K1", "Total Score"))
+        # The renamed column also leaves total without one, and no row is checked
+        self.assertIn(("total", "has no column"), [(e["field"], e["message"]) for e in errors])
+        self.assertEqual(len(errors), 2)
+
+    def test_missing_total_column_is_reported(self):
+        index = TOOL_HEADER.index("Total")
+        rows = [row[:index] + row[index + 1:] for row in tool_rows(NAMES)]
+        (error,) = self.errors(rows)
+        self.assertEqual((error["field"], error["cell"], error["message"]), ("total", "1", "has no column"))
+
+    def test_duplicate_column_is_reported(self):
+        rows = [row + [row[TOOL_HEADER.index("Provider")]] for row in tool_rows(NAMES)]
+        (error,) = self.errors(rows)
+        self.assertEqual(error["field"], "provider")
+        self.assertEqual(error["message"], "duplicates column C")
+
+    def test_total_must_equal_dimension_sum(self):
+        rows = tool_rows(NAMES)
+        total = rows[1][TOOL_HEADER.index("Total")]
+        rows[1][TOOL_HEADER.index("Total")] = total + 1
+        (error,) = self.errors(rows)
+        self.assertEqual((error["field"], error["cell"]), ("total", "K2"))
+        self.assertEqual(error["message"], f"does not equal the dimension sum {total}")
+
+    def test_fractional_score_is_rejected(self):
+        (error,) = self.errors(self.tools_with(1, "Continuity", "2.5"))
+        self.assertEqual((error["field"], error["message"]), ("continuity", "is not a whole number"))
+
+    def test_text_score_is_rejected(self):
+        (error,) = self.errors(self.tools_with(1, "Continuity", "high"))
+        self.assertEqual(error["message"], "is not a number")
+
+    def test_bad_select_value_is_rejected(self):
+        (error,) = self.errors(self.tools_with(3, "Risk Level", "Severe"))
+        self.assertEqual((error["field"], error["cell"]), ("riskLevel", "L4"))
+        self.assertTrue(error["message"].startswith("is not one of "))
+
+    def test_select_values_are_normalised(self):
+        tools, _ = self.read(self.tools_with(1, "Risk Level", "  high "))
+        self.assertEqual(tools[0]["riskLevel"], "High")
+
+    def test_errors_from_both_sheets_are_reported_together(self):
+        alternatives = alternative_rows(NAMES[:1])
+        alternatives[1][alternatives[0].index("Total")] = ""
+        errors = self.errors(self.tools_with(1, "Continuity", "x"), alternatives)
+        self.assertEqual(len({e["sheet"] for e in errors}), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()